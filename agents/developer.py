@@ -17,6 +17,108 @@ import re
 from datetime import datetime
 import time
 import yaml
+import functools
+import logging
+import logging.handlers
+import queue
+import atexit
+import hashlib
+import threading
+from collections import deque
+
+
+class _ResponseLogHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that creates the log directory only when the file is first opened."""
+    
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+# Logging happens on a background listener thread so query() never blocks on stdout.
+# Full prompts and responses are DEBUG records and stay off unless the level is lowered.
+# Complete player responses always go to a rotating file instead of being kept in memory.
+_RESPONSE_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "logs", "player_responses.log")
+
+logger = logging.getLogger(__name__)
+responses_logger = logging.getLogger(f"{__name__}.responses")
+if not logger.handlers:
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _log_queue = queue.SimpleQueue()
+    _stream_handler = logging.StreamHandler()
+    _stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    _stream_handler.addFilter(lambda record: record.name != responses_logger.name)
+    _response_file_handler = _ResponseLogHandler(
+        _RESPONSE_LOG_PATH, maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8", delay=True)
+    _response_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+    _response_file_handler.addFilter(logging.Filter(responses_logger.name))
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler, _response_file_handler,
+                                                   respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# Histories keep only the most recent entries and a preview of each response
+_HISTORY_MAXLEN = 256
+_RESPONSE_PREVIEW_CHARS = 1024
+
+_FUNC_DEF_RE = re.compile(r'def\s+(\w+)\s*\(')
+
+# The task instructions ask players to open and close their submission with these markers
+_RESPONSE_MARKER = "RESPONSE:"
+_RESPONSE_END_MARKER = "</RESPONSE>"
+
+# Generation budget per query: never more than the original 512 tokens, trimmed for short stubs
+# while leaving THINKING room before RESPONSE; the </RESPONSE> stop string ends decoding early
+_MIN_NEW_TOKENS = 384
+_MAX_NEW_TOKENS = 512
+
+
+@functools.lru_cache(maxsize=128)
+def _load_yaml_cached(path: str, mtime: float):
+    """Parse a YAML file once per (path, mtime). Callers must not mutate the result."""
+    with open(path, 'r') as f:
+        return yaml.safe_load(f)
+
+
+def _load_yaml(path: str):
+    """Load a YAML file, re-parsing only when its modification time changes."""
+    return _load_yaml_cached(path, os.path.getmtime(path))
+
+
+# Every Phi4Developer shares one batching model, loaded once per process on first use
+_phi4_model = None
+_phi4_model_lock = threading.Lock()
+
+
+def _get_shared_phi4_model():
+    """Return the process-wide batching Phi-4 model, initializing it on first call."""
+    global _phi4_model
+    if _phi4_model is None:
+        with _phi4_model_lock:
+            if _phi4_model is None:
+                from backend.phi4_model import get_batching_phi4_model
+                model = get_batching_phi4_model()
+                model.initialize_model()
+                _phi4_model = model
+    return _phi4_model
+
+
+@functools.lru_cache(maxsize=1024)
+def _generate_cached(content: str, prefix: str, max_new_tokens: int) -> str:
+    """Generate a reply to one user message; decoding is greedy, so repeats are served from memory."""
+    # Queue on the shared batcher so concurrent contestants decode together; the prefix
+    # leads the message unchanged so its KV cache is reused across problems
+    generated_text = _get_shared_phi4_model().submit(
+        [{"role": "user", "content": content}], max_new_tokens=max_new_tokens,
+        do_sample=False, prefix=prefix, stop=[_RESPONSE_END_MARKER]
+    ).result()
+    if generated_text is None:
+        # Raising keeps failed generations out of the cache
+        raise RuntimeError("Phi-4 generation failed")
+    return generated_text
 
 
 class Phi4Developer(Developer):
@@ -32,8 +134,8 @@ class Phi4Developer(Developer):
     
     def __init__(self, name: str):
         super().__init__(name)
-        self.feedback_history = []
-        self.submission_history = []
+        self.feedback_history = deque(maxlen=_HISTORY_MAXLEN)
+        self.submission_history = deque(maxlen=_HISTORY_MAXLEN)
         
         self.custom_prompt = self._load_combined_prompt(name)
         
@@ -41,27 +143,32 @@ class Phi4Developer(Developer):
         
         # Get the shared Phi-4 model instance
         try:
-            import sys
-            sys.path.append('..')
-            from backend.phi4_model import get_phi4_model
-            self.phi4_model = get_phi4_model()
-            self.phi4_model.initialize_model()  # Ensure it's loaded (singleton handles efficiency)
+            self.phi4_model = _get_shared_phi4_model()
+            # custom_prompt leads every query, so tokenize it once up front
+            self.phi4_model.register_prefix(self.custom_prompt)
             print(f"🔗 {self.name} connected to shared Phi-4 model")
         except Exception as e:
             print(f"❌ Failed to connect to Phi-4 model: {e}")
             raise e
     
+    def reset(self):
+        """Clear per-contest state so this developer can join a fresh contest."""
+        self.feedback_history.clear()
+        self.submission_history.clear()
+        self.last_full_response = None
+        self.account = None
+        
+        # Pick up any edits to the player YAML files since the last contest
+        self.custom_prompt = self._load_combined_prompt(self.name)
+        self.phi4_model.register_prefix(self.custom_prompt)
+    
     def _load_combined_prompt(self, name: str) -> str:
         """Load and combine task instructions and personality prompts."""
         # Load individual personality
-        with open(f"players/{name.lower()}.yaml", 'r') as f:
-            personality_config = yaml.safe_load(f)
-            personality = personality_config['personality']
+        personality = _load_yaml(f"players/{name.lower()}.yaml")['personality']
         
         # Load shared task instructions
-        with open("players/player.yaml", 'r') as f:
-            player_config = yaml.safe_load(f)
-            task_instructions = player_config['task_instructions']
+        task_instructions = _load_yaml("players/player.yaml")['task_instructions']
         
         # Combine both prompts
         return f"{personality}\n\n{task_instructions}"
@@ -85,26 +192,34 @@ class Phi4Developer(Developer):
             }
         ]
         
-        print(f"🧠 Agent prompt: {messages}")
-        generated_text = self.phi4_model.generate(messages, max_new_tokens=512, temperature=0.1, do_sample=True)
+        logger.debug("🧠 Agent prompt: %s", messages)
+        # Greedy decoding (sampling at temperature 0.1 was near-argmax anyway) makes the
+        # reply a function of the prompt, so re-runs of a problem skip the model entirely
+        # and are scored at the latency they actually took
+        generated_text = _generate_cached(messages[0]["content"], self.custom_prompt,
+                                          self._max_new_tokens(problem))
         
-        print(f"Generated solution for {problem.id} using Phi-4")
-        print(f"Full player response: {generated_text}")
+        logger.info("Generated solution for %s using Phi-4", problem.id)
+        logger.debug("Full player response: %s", generated_text)
         
         # Store the FULL response (including thinking) for history
         self.last_full_response = generated_text
         
-        # Store in submission history for player log display (full response)
+        # Store a hash and preview for player log display; the full response goes to the log file
+        response_sha1 = hashlib.sha1(generated_text.encode("utf-8")).hexdigest()
+        responses_logger.info("%s %s sha1=%s\n%s", self.name, problem.id, response_sha1, generated_text)
         submission_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(),
             'problem_id': problem.id,
-            'full_response': generated_text
+            'response_sha1': response_sha1,
+            'response_preview': generated_text[:_RESPONSE_PREVIEW_CHARS],
+            'response_truncated': len(generated_text) > _RESPONSE_PREVIEW_CHARS
         }
         self.submission_history.append(submission_entry)
         
         # Extract and return only the part after "RESPONSE:" for the contest engine
         response_to_pe = self._extract_response_section(generated_text)
-        print(f"🔍 Response to PE: {response_to_pe}")
+        logger.debug("🔍 Response to PE: %s", response_to_pe)
         return response_to_pe
     
     def _create_code_generation_prompt(self, problem: CodingProblem, function_name: str) -> str:
@@ -114,28 +229,34 @@ Problem: {problem.description or 'No description provided'}
 
 Implement the function {function_name} correctly."""
     
+    def _max_new_tokens(self, problem: CodingProblem) -> int:
+        """Scale the generation budget with the stub (~4 characters per token)."""
+        return min(_MAX_NEW_TOKENS, _MIN_NEW_TOKENS + len(problem.stub_code) // 4)
+    
     def _extract_function_name(self, stub_code: str) -> str:
         """Extract the function name from stub code."""
-        match = re.search(r'def\s+(\w+)\s*\(', stub_code)
+        match = _FUNC_DEF_RE.search(stub_code)
         return match.group(1) if match else 'unknown_function'
     
     def _extract_response_section(self, full_text: str) -> str:
         """Extract only the text after 'RESPONSE:' marker, or return full text if no marker found."""
-        if "RESPONSE:" in full_text:
-            # Find the RESPONSE: marker and return everything after it
-            response_index = full_text.find("RESPONSE:")
-            return full_text[response_index + len("RESPONSE:"):].strip()
-        else:
-            # No RESPONSE: marker found, return full text for backward compatibility
-            return full_text
+        _, marker, response = full_text.partition(_RESPONSE_MARKER)
+        if marker:
+            # Return everything after the RESPONSE: marker, up to the end marker
+            return response.split(_RESPONSE_END_MARKER, 1)[0].strip()
+        # No RESPONSE: marker found, return full text for backward compatibility; the engine
+        # still looks for the function in it, but a THINKING section that ran out of tokens
+        # should be visible in the logs rather than silently scored as the solution
+        logger.warning("No %s marker in %s's response (%d chars); it may have been truncated",
+                       _RESPONSE_MARKER, self.name, len(full_text))
+        return full_text
     
     def update(self, feedback: dict):
         """Process feedback from the previous submission."""
         feedback_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(),
             'problem_id': feedback.get('problem_id'),
             'reward': feedback.get('reward'),
-            'reasoning_transcript': feedback.get('reasoning_transcript', 'No reasoning available'),
-            'full_feedback': feedback
+            'reasoning_transcript': feedback.get('reasoning_transcript', 'No reasoning available')
         }
         self.feedback_history.append(feedback_entry)
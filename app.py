@@ -1,18 +1,26 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import time
 from datetime import datetime
 import sys
 import os
-import difflib
 import yaml
+import re
+import html
+import functools
+import threading
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
 
 # Add backend to path so we can import directly
 sys.path.append('backend')
 from contest_engine import ContestEngine
 from agents.developer import Phi4Developer
 
+PLAYERS_DIR = Path("players")
+
 # Page configuration
 st.set_page_config(
     page_title="A Game of LLMs",
@@ -21,172 +29,68 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Simple styling - just basic dark background
-st.markdown("""
-<style>
-    /* Basic dark background */
-    .stApp {
-        background-color: #1e1e1e;
-        color: #ffffff;
-    }
-    
-    /* Sidebar */
-    section[data-testid="stSidebar"] {
-        background-color: #262730;
-    }
-    
-    /* Custom component cards */
-    .metric-card {
-        background-color: #2d2d2d;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #4fc3f7;
-        margin-bottom: 1rem;
-        color: #ffffff;
-    }
-    
-    .metric-card h4 {
-        color: #4fc3f7;
-        margin-bottom: 0.5rem;
-    }
-    
-    .metric-card h2 {
-        margin: 0;
-        color: #ffffff;
-    }
-    
-    .problem-card {
-        background-color: #2d2d2d;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #ffb74d;
-        border: 1px solid #404040;
-        color: #ffffff;
-        margin-bottom: 1rem;
-    }
-    
-    .problem-card h4 {
-        color: #ffb74d;
-        margin-bottom: 0.5rem;
-    }
-    
-    .problem-card p {
-        color: #ffffff;
-        margin: 0.5rem 0;
-    }
-    
-    .evaluation-log {
-        background-color: #2d2d2d;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 1px solid #404040;
-        font-family: monospace;
-        font-size: 0.9rem;
-        max-height: 400px;
-        overflow-y: auto;
-        color: #ffffff;
-        margin-bottom: 1rem;
-    }
-    
-    .evaluation-log h5 {
-        color: #4fc3f7;
-        margin-bottom: 0.5rem;
-    }
-    
-    .evaluation-log p {
-        color: #ffffff;
-        margin: 0.25rem 0;
-    }
-    
-    /* Tab styling */
-    div[data-testid="stTabs"] [role="tablist"] {
-        background-color: #2d2d2d;
-        border-radius: 8px;
-        padding: 4px;
-    }
-    
-    div[data-testid="stTabs"] button[role="tab"] {
-        background: #404040;
-        color: #ffffff;
-        border: none;
-        border-radius: 4px;
-        padding: 8px 16px;
-        margin: 0 2px;
-    }
-    
-    div[data-testid="stTabs"] button[role="tab"][aria-selected="true"] {
-        background: #667eea;
-        color: #ffffff;
-    }
-    
-    /* Constitution diff styling */
-    .constitution-panel {
-        background-color: #2d2d2d;
-        border: 1px solid #404040;
-        border-radius: 0.5rem;
-        padding: 1rem;
-        font-family: 'Courier New', monospace;
-        font-size: 14px;
-        line-height: 1.4;
-        overflow-y: auto;
-        max-height: 500px;
-        color: #ffffff;
-    }
-    
-    .constitution-panel h4 {
-        color: #4fc3f7;
-        margin-bottom: 1rem;
-        font-size: 16px;
-        font-weight: 600;
-        border-bottom: 1px solid #404040;
-        padding-bottom: 0.5rem;
-    }
-    
-    .diff-added {
-        color: #ffffff;
-        background-color: rgba(40, 167, 69, 0.3);
-        border-left: 3px solid #28a745;
-        padding-left: 8px;
-    }
-    
-    .diff-removed {
-        color: #ffffff;
-        background-color: rgba(220, 53, 69, 0.3);
-        border-left: 3px solid #dc3545;
-        padding-left: 8px;
-    }
-    
-    .diff-controls {
-        background-color: #2d2d2d;
-        border: 1px solid #404040;
-        border-radius: 0.5rem;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        color: #ffffff;
-    }
-    
-    .version-indicator {
-        background-color: #404040;
-        border: 1px solid #505050;
-        border-radius: 4px;
-        padding: 0.25rem 0.5rem;
-        color: #ffffff;
-        font-family: monospace;
-        font-size: 12px;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Theme and primary button styling, built from assets/theme.src.css by tools/build_css.py
+@st.cache_resource
+def load_theme_css():
+    """Read the minified dashboard stylesheet once per server process."""
+    with open("assets/theme.min.css", 'r') as f:
+        return f"<style>\n{f.read()}</style>"
+
+st.markdown(load_theme_css(), unsafe_allow_html=True)
+
+# Show debug output in every session (otherwise only with ?debug=1)
+DEBUG = os.environ.get("AGOL_DEBUG") == "1"
+
+# Round numbers in transaction reasons
+_PROBLEM_RE = re.compile(r'Problem (\d+)')
+_NUMBER_RE = re.compile(r'(\d+)')
+
+# Points per player drawn in the balance chart; longer histories are downsampled with LTTB
+_MAX_CHART_POINTS = 500
+
+# Developer history fields copied as-is into player timeline event details
+_SUBMISSION_KEYS = ('problem_id', 'response_truncated', 'response_sha1', 'extracted_code')
+_FEEDBACK_KEYS = ('problem_id', 'reward', 'reasoning_transcript')
+
+# Player timeline events built per render until the rest are asked for; the "show all" flag
+# is kept per player and contest under this session_state key prefix
+_PLAYER_EVENTS_PAGE = 50
+_SHOW_ALL_EVENTS_PREFIX = "_show_all_events_"
+
+# One constitution diff line per class; bound .format so the diff loop skips the attribute lookup
+_DIFF_UNCHANGED_LINE = '<div class="diff-line diff-unchanged">{}</div>'.format
+_DIFF_REMOVED_LINE = '<div class="diff-line diff-removed">{}</div>'.format
+_DIFF_ADDED_LINE = '<div class="diff-line diff-added">{}</div>'.format
 
 # Initialize contest engine (singleton)
 @st.cache_resource
 def get_contest_engine():
     return ContestEngine.get_instance()
 
-def initialize_contest():
+@st.cache_resource
+def get_phi4_developer(name):
+    """Create each named developer once per server process; resets reuse the instance."""
+    return Phi4Developer(name)
+
+@st.cache_data(ttl=60)
+def get_available_players():
+    """Names of the players that have a personality file in players/ (rescanned at most once a minute)."""
+    shared = {'player.yaml', 'principle.yaml'}
+    return sorted(f.stem.capitalize() for f in PLAYERS_DIR.glob('*.yaml') if f.name not in shared)
+
+def initialize_contest(player_names=("Alice", "Bob")):
     """Initialize contest with fresh players."""
     engine = get_contest_engine()
     
+    if not player_names:
+        return False, "Select at least one player."
+    
     try:
+        # A new contest starts every player timeline back on its newest page, with evaluation history collapsed
+        for key in [key for key in st.session_state if str(key).startswith(_SHOW_ALL_EVENTS_PREFIX)]:
+            del st.session_state[key]
+        st.session_state.pop('_show_eval_history', None)
+        
         # Reset everything
         engine.state.is_active = False
         engine.state.start_time = None
@@ -198,18 +102,16 @@ def initialize_contest():
         engine.submissions = {}
         
         # Reset bank balances
-        engine.bank._balances = {}
-        engine.bank._transaction_history = []
+        engine.bank.reset()
         
         # Reset principle evaluator history
         engine.principle_evaluator.evaluation_history = []
         
-        alice = Phi4Developer("Alice")
-        bob = Phi4Developer("Bob")
-        
-        # Register them
-        engine.register_developer(alice)
-        engine.register_developer(bob)
+        # Reuse the cached players, clearing their per-contest history, and register them
+        for name in player_names:
+            developer = get_phi4_developer(name)
+            developer.reset()
+            engine.register_developer(developer)
         
         # Start the contest (but don't run it)
         engine.start_contest()
@@ -245,203 +147,301 @@ def step_contest():
     except Exception as e:
         return False, f"Error: {str(e)}"
 
-def display_leaderboard():
+def run_contest_rounds(rounds):
+    """Run up to `rounds` rounds back to back; the app reruns once afterwards, not once per round."""
+    engine = get_contest_engine()
+    progress_placeholder = st.sidebar.empty()
+    last_update = 0.0
+    
+    completed = 0
+    for _ in range(rounds):
+        success, message = step_contest()
+        if not success:
+            return False, message
+        completed += 1
+        
+        # Throttle progress updates to one every 50 ms
+        if time.monotonic() - last_update >= 0.05:
+            progress_placeholder.info(f"Finished {completed}/{rounds} rounds")
+            last_update = time.monotonic()
+        
+        if engine.state.current_problem_index >= len(engine.problems):
+            break
+    
+    progress_placeholder.empty()
+    return True, f"Ran {completed} round{'s' if completed != 1 else ''}. {message}"
+
+def run_remaining_contest():
+    """Run every remaining round, updating sidebar placeholders as each one completes."""
+    engine = get_contest_engine()
+    progress_placeholder = st.sidebar.empty()
+    leaderboard_placeholder = st.sidebar.empty()
+    
+    def on_event(event):
+        # Only the placeholders change per round; the app reruns once at the end
+        if event["type"] == "round_completed":
+            finished = engine.state.current_problem_index + 1  # Index advances after the event
+            progress_placeholder.info(f"Finished problem {event['data']['problem_id']} ({finished}/{len(engine.problems)})")
+            leaderboard_placeholder.dataframe(pd.DataFrame(event["data"]["leaderboard"]),
+                                              hide_index=True, use_container_width=True)
+    
+    engine.add_event_callback(on_event)
+    try:
+        engine.run_full_contest()
+        return True, "Contest completed! Final results available."
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+    finally:
+        engine.remove_event_callback(on_event)
+
+def debug_enabled():
+    """Debug output is opt-in via the ?debug=1 URL parameter, or AGOL_DEBUG=1 for every session."""
+    return DEBUG or st.query_params.get("debug") == "1"
+
+@st.cache_data(ttl=1, show_spinner=False)
+def get_bank_snapshot(version):
+    """Leaderboard and transaction history for one bank version, shared by every panel in a rerun."""
+    bank = get_contest_engine().bank
+    return bank.query_leaderboard(), bank.query_transaction_history()
+
+def get_dashboard_snapshot():
+    """Read-only engine state, re-read only when the engine revision moves and shared by the tab panels."""
+    engine = get_contest_engine()
+    revision = engine.revision
+    if st.session_state.get('_snapshot_revision') == revision:
+        return st.session_state['_snapshot']
+    
+    leaderboard, transactions = get_bank_snapshot(engine.bank.version)
+    st.session_state['_snapshot'] = {
+        'status': engine.get_contest_status(),
+        'constitution': engine.constitution.query(),
+        'history': list(engine.constitution.history),
+        'evaluations': engine.principle_evaluator.evaluation_history,
+        'leaderboard': leaderboard,
+        'transactions': transactions
+    }
+    st.session_state['_snapshot_revision'] = revision
+    return st.session_state['_snapshot']
+
+def transactions_signature(transactions):
+    """Cache key for the append-only transaction list: its length and newest timestamp."""
+    return (len(transactions), transactions[-1]['timestamp'] if transactions else None)
+
+@st.cache_data(ttl=10, show_spinner=False, hash_funcs={list: transactions_signature})
+def build_balance_history(transactions, players):
+    """Per-round running balances for each player, rebuilt only when a new transaction lands."""
+    # Every player starts at $0 in round 0
+    rounds = np.zeros(1, dtype=np.int64)
+    balance_rows = np.zeros((1, len(players)), dtype=np.int64)
+    
+    if transactions:
+        # Categorical actors (codes in player order; anyone else becomes NaN) and Arrow-backed reasons
+        df_transactions = pd.DataFrame(transactions)
+        df_transactions = df_transactions.assign(
+            actor=pd.Categorical(df_transactions['actor'], categories=players),
+            reason=df_transactions['reason'].astype(str).astype('string[pyarrow]')
+        )
+        df_transactions = df_transactions[df_transactions['actor'].notna()]
+        df_transactions = df_transactions.sort_values('timestamp_epoch', kind='stable')
+        reason = df_transactions['reason']
+        
+        # Round is "Problem N", else the number in a submission reason, else the player's transaction sequence
+        has_problem = reason.str.contains('Problem', regex=False)
+        has_submission = reason.str.contains('Submission', regex=False)
+        problem_number = reason.str.extract(_PROBLEM_RE, expand=False)
+        submission_number = reason.str.extract(_NUMBER_RE, expand=False).where(has_submission)
+        sequence = df_transactions.groupby('actor', observed=True).cumcount() + 1
+        df_transactions = df_transactions.assign(round=pd.to_numeric(
+            problem_number.where(has_problem, submission_number)
+        ).fillna(sequence).astype(int))
+        
+        # Only transactions related to actual problems/submissions; round 0 and earlier still count
+        # towards the running balance, they just aren't plotted as rounds of their own
+        relevant = has_problem | has_submission | reason.str.contains('evaluation', case=False, regex=False)
+        df_transactions = df_transactions[relevant]
+        
+        if not df_transactions.empty:
+            # Sum deltas per (round, player) cell: sort the flat cell ids once, then reduce each run
+            round_ids, round_index = np.unique(df_transactions['round'].clip(lower=0).to_numpy(), return_inverse=True)
+            player_index = df_transactions['actor'].cat.codes.to_numpy()
+            cells = round_index * len(players) + player_index
+            order = np.argsort(cells, kind='stable')
+            cells = cells[order]
+            deltas = pd.to_numeric(df_transactions['delta']).to_numpy()[order]
+            starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+            
+            per_round = np.zeros((len(round_ids), len(players)), dtype=deltas.dtype)
+            per_round.flat[cells[starts]] = np.add.reduceat(deltas, starts)
+            running = np.cumsum(per_round, axis=0)
+            
+            # Round-0 deltas are already carried in the running sums; the chart still starts at $0
+            plotted = round_ids > 0
+            rounds = np.concatenate([rounds, round_ids[plotted]])
+            balance_rows = np.vstack([balance_rows.astype(running.dtype), running[plotted]])
+    
+    # Running balance after each round, one row per (round, player)
+    balances = pd.DataFrame(balance_rows, index=pd.Index(rounds, name='round'), columns=list(players))
+    return balances.reset_index().melt(id_vars='round', var_name='player', value_name='balance')
+
+def downsample_lttb(x, y, max_points):
+    """Largest-Triangle-Three-Buckets: keep at most max_points points that preserve the line's shape."""
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return x, y
+    
+    # First and last points are always kept; each bucket in between keeps the point forming the
+    # largest triangle with the previously kept point and the average of the next bucket
+    bucket_size = (n - 2) / (max_points - 2)
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        keep[i + 1] = previous
+    return x[keep], y[keep]
+
+@st.cache_resource(max_entries=16, hash_funcs={list: transactions_signature})
+def build_balance_figure_json(transactions, players):
+    """Serialized balance chart for one ledger version, built once and shared by every session."""
+    df_history = build_balance_history(transactions, players)
+    
+    # One WebGL line per player, so the browser draws the series on the GPU instead of as SVG nodes
+    # (plotly is imported here, not at startup)
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    player_colors = {'Alice': '#4fc3f7', 'Bob': '#ff9800'}
+    fig_line = go.Figure()
+    for i, (player, player_history) in enumerate(df_history.groupby('player', sort=False)):
+        # Long contests are downsampled so the browser always draws a bounded number of points
+        rounds, balances = downsample_lttb(player_history['round'].to_numpy(),
+                                           player_history['balance'].to_numpy(), _MAX_CHART_POINTS)
+        fig_line.add_trace(go.Scattergl(
+            x=rounds,
+            y=balances,
+            mode='lines+markers',
+            name=player,
+            line=dict(color=player_colors.get(player, qualitative.Plotly[i % len(qualitative.Plotly)]))
+        ))
+    
+    fig_line.update_layout(
+        title="💰 Player Balance Over Rounds",
+        plot_bgcolor='#1e1e1e',
+        paper_bgcolor='#1e1e1e',
+        font=dict(color='white'),
+        title_font=dict(color='white', size=16),
+        xaxis=dict(
+            title="Round Number",
+            title_font=dict(color='white'),
+            tickfont=dict(color='white'),
+            gridcolor='#404040',
+            linecolor='white'
+        ),
+        yaxis=dict(
+            title="Balance ($)",
+            title_font=dict(color='white'),
+            tickfont=dict(color='white'),
+            gridcolor='#404040',
+            linecolor='white'
+        ),
+        height=400,
+        hovermode='x unified',
+        legend=dict(
+            font=dict(color='white'),
+            bgcolor='rgba(30,30,30,0.8)',
+            bordercolor='white'
+        ),
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    # Update traces for better visibility
+    fig_line.update_traces(
+        line=dict(width=4),
+        marker=dict(size=10, line=dict(color='white', width=2))
+    )
+    
+    return fig_line.to_json()
+
+def display_leaderboard(snapshot):
     """Display the current leaderboard."""
     engine = get_contest_engine()
-    leaderboard = engine.bank.query_leaderboard()
-    transactions = engine.bank.query_transaction_history()
+    leaderboard, transactions = snapshot['leaderboard'], snapshot['transactions']
     
     # Debug information
-    st.write(f"🔍 Debug: Found {len(leaderboard)} leaderboard entries, {len(transactions)} transactions")
+    if debug_enabled():
+        st.write(f"🔍 Debug: Found {len(leaderboard)} leaderboard entries, {len(transactions)} transactions")
     
     if leaderboard:
         # Filter out PrincipleEvaluator to show only players
         player_leaderboard = [entry for entry in leaderboard if entry['name'] != 'PrincipleEvaluator']
         
         if player_leaderboard:
-            # Always create balance history - starting with round 0 at $0 for all players
-            balance_history = []
-            
-            # Add starting point for all players at round 0
-            for player in [p['name'] for p in player_leaderboard]:
-                balance_history.append({
-                    'round': 0,
-                    'player': player,
-                    'balance': 0
-                })
-            
-            if transactions:
-                # Build from transaction history - only problem-related transactions
-                df_transactions = pd.DataFrame(transactions)
-                df_transactions['timestamp'] = pd.to_datetime(df_transactions['timestamp'])
-                
-                for player in [p['name'] for p in player_leaderboard]:
-                    player_txns = df_transactions[df_transactions['actor'] == player].copy()
-                    
-                    if not player_txns.empty:
-                        player_txns = player_txns.sort_values('timestamp')
-                        
-                        running_balance = 0
-                        for idx, (_, txn) in enumerate(player_txns.iterrows()):
-                            reason = str(txn['reason'])
-                            
-                            # Only process transactions related to actual problems/submissions
-                            if 'Problem' in reason or 'Submission' in reason or 'evaluation' in reason.lower():
-                                running_balance += txn['delta']
-                                
-                                # Better round extraction logic
-                                round_num = 0  # Default
-                                
-                                # Try multiple patterns to extract round number
-                                if 'Problem' in reason:
-                                    import re
-                                    # Look for "Problem X" patterns
-                                    match = re.search(r'Problem (\d+)', reason)
-                                    if match:
-                                        round_num = int(match.group(1))
-                                    else:
-                                        # Fallback: use transaction sequence
-                                        round_num = idx + 1
-                                elif 'Submission' in reason:
-                                    # Extract from submission patterns
-                                    import re
-                                    match = re.search(r'(\d+)', reason)
-                                    if match:
-                                        round_num = int(match.group(1))
-                                    else:
-                                        round_num = idx + 1
-                                else:
-                                    # Use transaction sequence as fallback for evaluation transactions
-                                    round_num = idx + 1
-                                
-                                # Only add if this is a valid problem round (> 0)
-                                if round_num > 0:
-                                    balance_history.append({
-                                        'round': round_num,
-                                        'player': player,
-                                        'balance': running_balance
-                                    })
-            
-            # Create the line plot
-            df_history = pd.DataFrame(balance_history)
-            
-            fig_line = px.line(
-                df_history,
-                x='round',
-                y='balance',
-                color='player',
-                title="💰 Player Balance Over Rounds",
-                markers=True,
-                color_discrete_map={'Alice': '#4fc3f7', 'Bob': '#ff9800'}
-            )
-            
-            fig_line.update_layout(
-                plot_bgcolor='#1e1e1e',
-                paper_bgcolor='#1e1e1e',
-                font=dict(color='white'),
-                title_font=dict(color='white', size=16),
-                xaxis=dict(
-                    title="Round Number",
-                    title_font=dict(color='white'),
-                    tickfont=dict(color='white'),
-                    gridcolor='#404040',
-                    linecolor='white'
-                ),
-                yaxis=dict(
-                    title="Balance ($)",
-                    title_font=dict(color='white'),
-                    tickfont=dict(color='white'),
-                    gridcolor='#404040',
-                    linecolor='white'
-                ),
-                height=400,
-                hovermode='x unified',
-                legend=dict(
-                    font=dict(color='white'),
-                    bgcolor='rgba(30,30,30,0.8)',
-                    bordercolor='white'
-                ),
-                margin=dict(l=50, r=50, t=50, b=50)
-            )
-            
-            # Update traces for better visibility
-            fig_line.update_traces(
-                line=dict(width=4),
-                marker=dict(size=10, line=dict(color='white', width=2))
-            )
-            
-            st.plotly_chart(fig_line, use_container_width=True)
+            # Rebuild this session's chart only when the ledger or the player set changes
+            players = tuple(p['name'] for p in player_leaderboard)
+            fig_sig = (engine.bank.version, len(transactions), tuple(sorted(players)))
+            if st.session_state.get('_fig_sig') != fig_sig:
+                import plotly.io as pio
+                st.session_state['_fig'] = pio.from_json(build_balance_figure_json(transactions, players))
+                st.session_state['_fig_sig'] = fig_sig
+            st.plotly_chart(st.session_state['_fig'], use_container_width=True)
             
             # Show current balances table
             st.subheader("📊 Current Balances")
-            col1, col2 = st.columns(2)
-            for i, entry in enumerate(player_leaderboard):
-                with col1 if i % 2 == 0 else col2:
-                    color = "green" if entry['balance'] >= 0 else "red"
-                    st.markdown(f"**{entry['name']}**: <span style='color: {color}'>${entry['balance']:,}</span>", 
-                              unsafe_allow_html=True)
+            medals = ['🥇', '🥈', '🥉']
+            df_balances = pd.DataFrame({
+                'Rank': [medals[i] if i < len(medals) else str(i + 1) for i in range(len(player_leaderboard))],
+                'Player': [entry['name'] for entry in player_leaderboard],
+                'Balance': [entry['balance'] for entry in player_leaderboard]
+            })
+            st.dataframe(
+                df_balances.style
+                .format({'Balance': '${:,}'})
+                .map(lambda v: 'color: green' if v >= 0 else 'color: red', subset=['Balance']),
+                hide_index=True,
+                use_container_width=True
+            )
         else:
             st.info("No players registered yet")
     else:
         st.info("No participants yet")
 
-def display_contest_status():
-    """Display current contest status."""
-    engine = get_contest_engine()
-    status = engine.get_contest_status()
+def display_debug_info():
+    """Display contest debug info in the sidebar."""
+    if not debug_enabled():
+        return
+    
+    status = get_dashboard_snapshot()['status']
     
-    # Debug info
     st.sidebar.write(f"🔍 **Debug Info:**")
-    st.sidebar.write(f"Contest active: {status['is_active']}")
-    st.sidebar.write(f"Problem: {status['current_problem_index'] + 1}/{status['total_problems']}")
-    st.sidebar.write(f"Participants: {len(status['participants'])}")
-    st.sidebar.write(f"Last update: {datetime.now().strftime('%H:%M:%S')}")
+    st.sidebar.json({
+        "contest_active": status['is_active'],
+        "problem": f"{status['current_problem_index'] + 1}/{status['total_problems']}",
+        "participants": len(status['participants'])
+    })
+
+def display_contest_status(snapshot):
+    """Display current contest status."""
+    status = snapshot['status']
     
     col1, col2, col3, col4 = st.columns(4)
     
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <h4>Contest Status</h4>
-            <h2>{}</h2>
-        </div>
-        """.format("🟢 Active" if status["is_active"] else "🔴 Inactive"), 
-        unsafe_allow_html=True)
+    col1.metric("Contest Status", "🟢 Active" if status["is_active"] else "🔴 Inactive")
+    col2.metric("Current Problem", f"{status['current_problem_index'] + 1}/{status['total_problems']}")
+    col3.metric("Participants", len(status["participants"]))
     
-    with col2:
-        st.markdown("""
-        <div class="metric-card">
-            <h4>Current Problem</h4>
-            <h2>{}/{}</h2>
-        </div>
-        """.format(status["current_problem_index"] + 1, status["total_problems"]), 
-        unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="metric-card">
-            <h4>Participants</h4>
-            <h2>{}</h2>
-        </div>
-        """.format(len(status["participants"])), 
-        unsafe_allow_html=True)
-    
-    with col4:
-        start_time = status.get("start_time")
-        if start_time:
-            start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            elapsed = datetime.now() - start_dt.replace(tzinfo=None)
-            elapsed_str = str(elapsed).split('.')[0]  # Remove microseconds
-        else:
-            elapsed_str = "Not started"
-        
-        st.markdown("""
-        <div class="metric-card">
-            <h4>Elapsed Time</h4>
-            <h2>{}</h2>
-        </div>
-        """.format(elapsed_str), 
-        unsafe_allow_html=True)
+    start_time = status.get("start_time")
+    if start_time:
+        start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+        elapsed = datetime.now() - start_dt.replace(tzinfo=None)
+        elapsed_str = str(elapsed).split('.')[0]  # Remove microseconds
+    else:
+        elapsed_str = "Not started"
+    col4.metric("Elapsed Time", elapsed_str)
     
     # Current problem details
     if status.get("current_problem"):
@@ -460,52 +460,143 @@ def display_contest_status():
             problem.get("description", "No description available"),
             problem["stub_code"]
         ), unsafe_allow_html=True)
+    
+    if debug_enabled():
+        st.caption(f"Last update: {datetime.now().strftime('%H:%M:%S')}")
 
-def display_principle_evaluator_output():
-    """Display Principle Evaluator's recent evaluations and decisions."""
-    engine = get_contest_engine()
-    evaluations = engine.principle_evaluator.evaluation_history
+def get_evaluation_log_html(evaluations):
+    """Log HTML for each evaluation; history is append-only, so only new entries are rendered."""
+    # A contest reset replaces the history list, which starts the cache over
+    cache = st.session_state.get('_eval_html')
+    if cache is None or st.session_state.get('_eval_source') != id(evaluations) or len(cache) > len(evaluations):
+        cache = st.session_state['_eval_html'] = []
+        st.session_state['_eval_source'] = id(evaluations)
+    
+    for evaluation in evaluations[len(cache):]:
+        cache.append("".join(f"<p>• {html.escape(str(entry))}</p>" for entry in evaluation.get('log', [])))
+    return cache
+
+def display_principle_evaluator_output(snapshot, show_history=False):
+    """Display Principle Evaluator's latest evaluation, and with show_history the older ones too."""
+    evaluations = snapshot['evaluations']
     
     st.subheader("🤖 Principle Evaluator Output")
     
     if evaluations:
+        log_html = get_evaluation_log_html(evaluations)
+        
         # Show latest evaluation
         latest = evaluations[-1]
-        
         st.markdown(f"""
         <div class="evaluation-log">
             <h5>Latest Evaluation - Problem {latest['problem_id']}</h5>
             <p><strong>Timestamp:</strong> {latest['timestamp']}</p>
+            {log_html[-1]}
+        </div>
         """, unsafe_allow_html=True)
         
-        # Display evaluation log
-        for log_entry in latest.get('log', []):
-            st.markdown(f"<p>• {log_entry}</p>", unsafe_allow_html=True)
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        
-        # Show evaluation history
-        if len(evaluations) > 1:
+        # Show evaluation history; older entries are only sent to the browser once asked for
+        if show_history and len(evaluations) > 1:
             with st.expander("📜 Evaluation History"):
-                for eval_data in reversed(evaluations[:-1]):
-                    st.markdown(f"**Problem {eval_data['problem_id']}** - {eval_data['timestamp']}")
-                    for log_entry in eval_data.get('log', []):
-                        st.text(f"  • {log_entry}")
-                    st.markdown("---")
+                if st.session_state.get('_show_eval_history') or st.button(
+                        f"Load {len(evaluations) - 1} older evaluations", key="load_eval_history"):
+                    st.session_state['_show_eval_history'] = True
+                    st.markdown("<hr>".join(
+                        f"<p><strong>Problem {eval_data['problem_id']}</strong> - {eval_data['timestamp']}</p>{entry_html}"
+                        for eval_data, entry_html in zip(reversed(evaluations[:-1]), reversed(log_html[:-1]))
+                    ), unsafe_allow_html=True)
     else:
         st.info("No evaluations yet")
 
-def display_constitution():
+@functools.lru_cache(maxsize=1)
+def get_sequence_matcher():
+    """Matcher class for constitution diffs: cdifflib's C drop-in when installed, else difflib's."""
+    try:
+        from cdifflib import CSequenceMatcher as SequenceMatcher
+    except ImportError:
+        from difflib import SequenceMatcher
+    return SequenceMatcher
+
+def constitution_history_signature(history):
+    """Cache key for the append-only constitution history: its length and newest timestamp."""
+    return (len(history), history[-1]['timestamp'] if history else None)
+
+@st.cache_resource(max_entries=4, hash_funcs={list: constitution_history_signature})
+def build_constitution_versions(history, current_text):
+    """Current constitution followed by every historical version, newest first. Callers must not mutate it."""
+    # Built oldest first, then flipped once
+    versions = [{
+        'timestamp': change['timestamp'],
+        'text': change['new_text'],
+        'updated_by': change['updated_by'],
+        'version_num': n
+    } for n, change in enumerate(history, start=1)]
+    
+    versions.append({
+        'timestamp': 'Current',
+        'text': current_text,
+        'updated_by': 'Current State',
+        'version_num': len(history) + 1
+    })
+    versions.reverse()
+    return versions
+
+@st.cache_resource(max_entries=4, hash_funcs={list: constitution_history_signature})
+def build_constitution_history_markdown(history):
+    """Every constitution change, newest first, as one markdown document."""
+    # Change n (1-based) produced version n + 1; render oldest first, then flip once
+    blocks = [
+        f"**Version {n + 1}** - {change['timestamp']} - Updated by {change['updated_by']}\n\n"
+        f"Previous text:\n```\n{change['old_text']}\n```\n"
+        f"New text:\n```\n{change['new_text']}\n```"
+        for n, change in enumerate(history, start=1)
+    ]
+    blocks.reverse()
+    return "\n\n---\n\n".join(blocks)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_constitution_diff(left_text, right_text):
+    """Side-by-side diff HTML and added/removed line counts for two constitution versions."""
+    left_lines = left_text.splitlines()
+    right_lines = right_text.splitlines()
+    
+    # Opcodes label every line span in one pass; lines compare with surrounding whitespace ignored
+    matcher = get_sequence_matcher()(a=[line.strip() for line in left_lines],
+                                     b=[line.strip() for line in right_lines], autojunk=False)
+    
+    left_parts = []
+    right_parts = []
+    added_lines = removed_lines = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        left_line = _DIFF_UNCHANGED_LINE if tag == 'equal' else _DIFF_REMOVED_LINE
+        right_line = _DIFF_UNCHANGED_LINE if tag == 'equal' else _DIFF_ADDED_LINE
+        left_parts.extend(left_line(html.escape(line)) for line in left_lines[i1:i2])
+        right_parts.extend(right_line(html.escape(line)) for line in right_lines[j1:j2])
+        if tag != 'equal':
+            removed_lines += i2 - i1
+            added_lines += j2 - j1
+    
+    return "".join(left_parts), "".join(right_parts), added_lines, removed_lines
+
+def render_diff_panel(version, label, lines_html):
+    """Version indicator and constitution panel for one side of the diff, as a single HTML block."""
+    return (
+        f'<div class="version-indicator">Version {version["version_num"]} | {version["timestamp"]} | {version["updated_by"]}</div>'
+        f'<div class="constitution-panel"><h4>📄 Version {version["version_num"]} ({label})</h4>'
+        f'<div class="version-info">{version["timestamp"]} by {version["updated_by"]}</div>{lines_html}</div>'
+    )
+
+def display_constitution(snapshot):
     """Display current constitution and allow updates with side-by-side diff comparison."""
     engine = get_contest_engine()
-    constitution_text = engine.constitution.query()
-    history = engine.constitution.history
+    constitution_text = snapshot['constitution']
+    history = snapshot['history']
     
     st.subheader("📜 Contest Constitution")
     
     # Display current constitution
     st.markdown("""
-    <div class="metric-card">
+    <div class="constitution-panel">
         <h4>Current Rules</h4>
         <pre>{}</pre>
     </div>
@@ -532,25 +623,8 @@ def display_constitution():
         st.markdown("---")
         st.subheader("📊 Constitution Changes Comparison")
         
-        # Create versions list (current + history)
-        versions = []
-        
-        # Add current version
-        versions.append({
-            'timestamp': 'Current',
-            'text': constitution_text,
-            'updated_by': 'Current State',
-            'version_num': len(history) + 1
-        })
-        
-        # Add historical versions (newest first)
-        for i, change in enumerate(reversed(history)):
-            versions.append({
-                'timestamp': change['timestamp'],
-                'text': change['new_text'],
-                'updated_by': change['updated_by'],
-                'version_num': len(history) - i
-            })
+        # Versions list (current + history, newest first), rebuilt only when the constitution changes
+        versions = build_constitution_versions(history, constitution_text)
         
         # Comparison controls
         st.markdown("""
@@ -585,79 +659,18 @@ def display_constitution():
             left_version = versions[max_version - comparison_start]  # Earlier version
             right_version = versions[max_version - comparison_start - 1]  # Later version
             
-            # Display version info
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"""
-                <div class="version-indicator">
-                    Version {left_version['version_num']} | {left_version['timestamp']} | {left_version['updated_by']}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="version-indicator">
-                    Version {right_version['version_num']} | {right_version['timestamp']} | {right_version['updated_by']}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Generate diff
-            left_lines = left_version['text'].splitlines()
-            right_lines = right_version['text'].splitlines()
-            
-            diff = list(difflib.unified_diff(left_lines, right_lines, lineterm=''))
-            
-            # Create side-by-side comparison
-            st.markdown('<div class="constitution-diff-container">', unsafe_allow_html=True)
+            # Classified diff for this pair of versions; stored texts never change, so reruns replay it
+            left_content, right_content, added_lines, removed_lines = build_constitution_diff(
+                left_version['text'], right_version['text'])
             
+            # Side-by-side comparison, one markdown element per column
             col1, col2 = st.columns(2)
-            
             with col1:
-                st.markdown(f"""
-                <div class="constitution-panel">
-                    <h4>📄 Version {left_version['version_num']} (Before)</h4>
-                    <div class="version-info">{left_version['timestamp']} by {left_version['updated_by']}</div>
-                """, unsafe_allow_html=True)
-                
-                # Process lines for left panel
-                left_content = ""
-                for line in left_lines:
-                    # Check if this line was removed in the diff
-                    line_removed = any(d.startswith('-') and d[1:].strip() == line.strip() for d in diff)
-                    
-                    if line_removed:
-                        left_content += f'<div class="diff-line diff-removed">{line}</div>'
-                    else:
-                        left_content += f'<div class="diff-line diff-unchanged">{line}</div>'
-                
-                st.markdown(left_content + "</div>", unsafe_allow_html=True)
-            
+                st.markdown(render_diff_panel(left_version, "Before", left_content), unsafe_allow_html=True)
             with col2:
-                st.markdown(f"""
-                <div class="constitution-panel">
-                    <h4>📄 Version {right_version['version_num']} (After)</h4>
-                    <div class="version-info">{right_version['timestamp']} by {right_version['updated_by']}</div>
-                """, unsafe_allow_html=True)
-                
-                # Process lines for right panel
-                right_content = ""
-                for line in right_lines:
-                    # Check if this line was added in the diff
-                    line_added = any(d.startswith('+') and d[1:].strip() == line.strip() for d in diff)
-                    
-                    if line_added:
-                        right_content += f'<div class="diff-line diff-added">{line}</div>'
-                    else:
-                        right_content += f'<div class="diff-line diff-unchanged">{line}</div>'
-                
-                st.markdown(right_content + "</div>", unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+                st.markdown(render_diff_panel(right_version, "After", right_content), unsafe_allow_html=True)
             
             # Show diff summary
-            added_lines = len([d for d in diff if d.startswith('+')])
-            removed_lines = len([d for d in diff if d.startswith('-')])
-            
             if added_lines > 0 or removed_lines > 0:
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -673,83 +686,128 @@ def display_constitution():
     # Constitution history (collapsed by default)
     if history:
         with st.expander("📚 Full Constitution History"):
-            for i, change in enumerate(reversed(history)):
-                version_num = len(history) - i + 1
-                st.markdown(f"**Version {version_num}** - {change['timestamp']} - Updated by {change['updated_by']}")
-                st.text("Previous text:")
-                st.code(change['old_text'])
-                st.text("New text:")
-                st.code(change['new_text'])
-                st.markdown("---")
+            st.markdown(build_constitution_history_markdown(history))
+
+@st.cache_data(ttl=10, show_spinner=False, hash_funcs={list: transactions_signature})
+def get_recent_transactions(transactions, limit=10):
+    """Newest transactions first, with a display time, rebuilt only when a new transaction lands."""
+    df = pd.DataFrame(transactions).nlargest(limit, 'timestamp_epoch')
+    df['time'] = [datetime.fromtimestamp(ns / 1e9).strftime('%H:%M:%S') for ns in df['timestamp_epoch']]
+    return df
 
-def display_bank_transactions():
+def display_bank_transactions(snapshot):
     """Display bank transaction history."""
-    engine = get_contest_engine()
-    transactions = engine.bank.query_transaction_history()
+    transactions = snapshot['transactions']
     
     if transactions:
         st.subheader("💳 Recent Bank Transactions")
         
-        # Convert to DataFrame for better display
-        df = pd.DataFrame(transactions)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp', ascending=False)
-        
-        # Show recent transactions
-        recent_transactions = df.head(10)
-        
-        for _, transaction in recent_transactions.iterrows():
-            col1, col2, col3, col4 = st.columns([2, 2, 1, 2])
-            
-            with col1:
-                st.text(transaction['actor'])
-            with col2:
-                st.text(transaction['timestamp'].strftime('%H:%M:%S'))
-            with col3:
-                color = "green" if transaction['delta'] >= 0 else "red"
-                st.markdown(f"<span style='color: {color}'>{transaction['delta']:+}</span>", 
-                          unsafe_allow_html=True)
-            with col4:
-                st.text(transaction.get('reason', ''))
+        # Show recent transactions as one table, deltas coloured by sign
+        recent_transactions = get_recent_transactions(transactions)
+        st.dataframe(
+            recent_transactions[['actor', 'time', 'delta', 'reason']]
+            .rename(columns={'actor': 'Actor', 'time': 'Time', 'delta': 'Delta', 'reason': 'Reason'})
+            .style
+            .format({'Delta': '{:+}'})
+            .map(lambda v: 'color: green' if v >= 0 else 'color: red', subset=['Delta']),
+            hide_index=True,
+            use_container_width=True
+        )
     else:
         st.info("No transactions yet")
 
+@st.cache_resource
+def load_player_personalities():
+    """Parse players/*.yaml once per process: {display name: parsed YAML, or the exception raised loading it}."""
+    # libyaml's C loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    personalities = {}
+    for player_file in sorted(PLAYERS_DIR.glob('*.yaml')):
+        player_name = player_file.stem.title()
+        try:
+            # Bytes straight to libyaml; it detects the encoding itself
+            with player_file.open('rb') as f:
+                personalities[player_name] = yaml.load(f, Loader=loader)
+        except Exception as e:
+            personalities[player_name] = e
+    return personalities
+
 def display_player_personalities():
     """Display loaded player personalities."""
     st.subheader("🎭 Player Personalities")
     
-    # Load and display personality files
-    player_files = [f for f in os.listdir("players") if f.endswith('.yaml')]
+    personalities = load_player_personalities()
     
-    if not player_files:
+    if not personalities:
         st.warning("No player personality files found in 'players' directory.")
         return
     
-    for player_file in sorted(player_files):
-        player_name = player_file[:-5].title()  # Remove .yaml and capitalize
+    for display_name, personality in personalities.items():
+        if isinstance(personality, Exception):
+            st.error(f"Error loading personality for {display_name}: {personality}")
+            continue
         
-        try:
-            with open(f"players/{player_file}", 'r') as f:
-                personality = yaml.safe_load(f)
-            
-            # Extract name from filename if not in YAML
-            display_name = player_name
-            
-            with st.expander(f"🎯 {display_name} - Character Profile"):
-                # Show the complete prompt
-                if personality.get('prompt'):
-                    st.markdown("**Complete Character Profile & Instructions:**")
-                    st.markdown(personality['prompt'])
-                else:
-                    st.warning(f"No prompt found for {display_name}")
+        with st.expander(f"🎯 {display_name} - Character Profile"):
+            # Show the complete prompt
+            if personality.get('prompt'):
+                st.markdown("**Complete Character Profile & Instructions:**")
+                st.markdown(personality['prompt'])
+            else:
+                st.warning(f"No prompt found for {display_name}")
+
+def escape_block_text(text):
+    """HTML-escape text and encode its newlines, so a blank line can't end the enclosing HTML block."""
+    return html.escape(str(text)).replace("\n", "&#10;")
+
+def build_player_event_html(event, full_time, short_time, expanded=False):
+    """HTML for one player history event: a collapsible summary line over its details."""
+    event_type, description, details = event['type'], event['description'], event['details']
+    body = []
+    if event_type == 'Transaction':
+        amount = details['amount']
+        color = "green" if amount >= 0 else "red"
+        body.append(f"<p><strong>Amount:</strong> <span style='color: {color}'>${amount:+}</span></p>")
+        body.append(f"<p><strong>Reason:</strong> {escape_block_text(details['reason'])}</p>")
+        body.append(f"<p><strong>Balance After:</strong> ${details['balance_after']:,}</p>")
+    
+    elif event_type == 'Submission':
+        body.append(f"<p><strong>Problem:</strong> {escape_block_text(details['problem_id'])}</p>")
         
-        except Exception as e:
-            st.error(f"Error loading personality for {player_name}: {e}")
+        # Show the full player response
+        full_response = details['full_response']
+        if full_response:
+            body.append("<p><strong>Player's Complete Response:</strong></p>")
+            body.append(f"<pre>{escape_block_text(full_response)}</pre>")
+            if details.get('response_truncated'):
+                body.append(f'<p class="player-event-caption">Truncated preview - full response '
+                            f'(sha1 {details["response_sha1"]}) is in logs/player_responses.log</p>')
+    
+    elif event_type == 'Feedback':
+        body.append(f"<p><strong>Problem:</strong> {escape_block_text(details['problem_id'])}</p>")
+        
+        # Show Principle Evaluator's reasoning transcript
+        reasoning_transcript = details['reasoning_transcript']
+        if reasoning_transcript and reasoning_transcript != 'No reasoning available':
+            body.append("<p><strong>🧠 Principle Evaluator's Reasoning:</strong></p>")
+            body.append(f'<div class="player-event-transcript">{escape_block_text(reasoning_transcript)}</div>')
+        
+        # Show final reward
+        reward = details['reward']
+        if reward is not None:
+            color = "green" if reward >= 0 else "red"
+            body.append(f"<p><strong>💰 Final Reward: <span style='color: {color}'>${reward:+}</span></strong></p>")
+    
+    return (
+        f'<details class="player-event"{" open" if expanded else ""}>'
+        f'<summary><strong>{full_time}</strong> - {event_type}: {escape_block_text(description)}</summary>'
+        f'<div class="player-event-body"><div><p><strong>Type:</strong> {event_type}</p>'
+        f'<p><strong>Time:</strong> {short_time}</p></div><div>{"".join(body)}</div></div></details>'
+    )
 
-def display_player_history():
+def display_player_history(snapshot):
     """Display detailed history for a selected player."""
     engine = get_contest_engine()
-    leaderboard = engine.bank.query_leaderboard()
+    leaderboard, transactions = snapshot['leaderboard'], snapshot['transactions']
     
     # First show player personalities
     display_player_personalities()
@@ -764,6 +822,12 @@ def display_player_history():
         st.info("No players registered yet. Initialize the contest first!")
         return
     
+    # The timeline is only built once asked for; until then this tab costs one button per run
+    if not st.session_state.get('_show_player_history') and not st.button(
+            "📂 Load player history", key="load_player_history"):
+        return
+    st.session_state['_show_player_history'] = True
+    
     # Player selection dropdown
     selected_player = st.selectbox(
         "🎯 Select Player",
@@ -781,32 +845,31 @@ def display_player_history():
             return
         
         developer = engine.developers[selected_player]
+        submission_history = getattr(developer, 'submission_history', None)
+        feedback_history = getattr(developer, 'feedback_history', None)
         
         # Debug information
-        st.write(f"🔍 **Debug Info for {selected_player}:**")
-        st.write(f"  - Developer object found: {developer is not None}")
-        st.write(f"  - Has submission_history: {hasattr(developer, 'submission_history')}")
-        if hasattr(developer, 'submission_history'):
-            st.write(f"  - Submission history length: {len(developer.submission_history)}")
-        st.write(f"  - Has feedback_history: {hasattr(developer, 'feedback_history')}")
-        if hasattr(developer, 'feedback_history'):
-            st.write(f"  - Feedback history length: {len(developer.feedback_history)}")
-        st.write(f"  - Total problems in engine.submissions: {len(engine.submissions)}")
-        st.write(f"  - Problems with submissions: {list(engine.submissions.keys())}")
-        for prob_id, subs in engine.submissions.items():
-            if selected_player in subs:
-                st.write(f"    - {prob_id}: Has submission ({len(subs[selected_player])} chars)")
+        if debug_enabled():
+            st.write(f"🔍 **Debug Info for {selected_player}:**")
+            st.json({
+                "developer_found": developer is not None,
+                "submission_history_length": len(submission_history or []),
+                "feedback_history_length": len(feedback_history or []),
+                "problems_with_submissions": list(engine.submissions.keys()),
+                "submission_chars": {prob_id: len(subs[selected_player])
+                                     for prob_id, subs in engine.submissions.items() if selected_player in subs}
+            }, expanded=False)
         
-        # Collect all player-related events
+        # Collect all player-related events; records without a timestamp all share this one
         events = []
+        now = datetime.now()
         
         # 1. Get transaction history for this player
-        transactions = engine.bank.query_transaction_history()
         player_transactions = [txn for txn in transactions if txn['actor'] == selected_player]
         
         for txn in player_transactions:
             events.append({
-                'timestamp': pd.to_datetime(txn['timestamp']),
+                'timestamp': txn['timestamp'],
                 'type': 'Transaction',
                 'description': f"${txn['delta']:+} - {txn['reason']}",
                 'details': {
@@ -817,65 +880,43 @@ def display_player_history():
             })
         
         # 2. Get submission history from the developer object (shows full responses)
-        if hasattr(developer, 'submission_history'):
-            for submission in developer.submission_history:
-                submission_timestamp = submission.get('timestamp')
-                if not submission_timestamp:
-                    submission_timestamp = datetime.now().isoformat()
-                
-                # Convert string timestamp to datetime if needed
-                if isinstance(submission_timestamp, str):
-                    submission_timestamp = pd.to_datetime(submission_timestamp)
+        if submission_history:
+            for submission in submission_history:
+                submission_timestamp = submission.get('timestamp') or now
+                details = {key: submission.get(key) for key in _SUBMISSION_KEYS}
+                details['full_response'] = submission.get('response_preview')
+                details['submission_time'] = submission_timestamp
                 
                 events.append({
                     'timestamp': submission_timestamp,
                     'type': 'Submission',
                     'description': f"Submitted solution for {submission.get('problem_id', 'Unknown Problem')}",
-                    'details': {
-                        'problem_id': submission.get('problem_id'),
-                        'full_response': submission.get('full_response'),
-                        'extracted_code': submission.get('extracted_code'),
-                        'submission_time': submission_timestamp
-                    }
+                    'details': details
                 })
 
         # 3. Get feedback history from the developer object
-        if hasattr(developer, 'feedback_history'):
-            for feedback in developer.feedback_history:
-                feedback_timestamp = feedback.get('timestamp')
-                if not feedback_timestamp:
-                    # If no timestamp in feedback, try to infer from submission time or use current time
-                    feedback_timestamp = datetime.now().isoformat()
+        if feedback_history:
+            for feedback in feedback_history:
+                # If no timestamp in feedback, use current time
+                feedback_timestamp = feedback.get('timestamp') or now
                 
                 # Add the feedback event
                 events.append({
-                    'timestamp': pd.to_datetime(feedback_timestamp),
+                    'timestamp': feedback_timestamp,
                     'type': 'Feedback',
                     'description': f"Received feedback for {feedback.get('problem_id', 'Unknown Problem')}",
-                    'details': {
-                        'problem_id': feedback.get('problem_id'),
-                        'reward': feedback.get('reward'),
-                        'bank_balance': feedback.get('bank_balance'),
-                        'result': feedback.get('result'),
-                        'constitution': feedback.get('constitution'),
-                        'reasoning_transcript': feedback.get('reasoning_transcript'),
-                        'full_feedback': feedback
-                    }
+                    'details': {key: feedback.get(key) for key in _FEEDBACK_KEYS}
                 })
                 
         # 4. Get any additional submissions from engine.submissions that might not have feedback yet
+        known_problem_ids = {submission.get('problem_id') for submission in submission_history or []}
         for problem_id, problem_submissions in engine.submissions.items():
             if selected_player in problem_submissions:
-                # Check if we already have this submission from submission_history
-                has_submission_record = any(
-                    submission.get('problem_id') == problem_id 
-                    for submission in getattr(developer, 'submission_history', [])
-                )
-                
-                if not has_submission_record:
+                # Skip submissions we already have from submission_history
+                if problem_id not in known_problem_ids:
                     # This is a submission without proper history record yet
                     submission_code = problem_submissions[selected_player]
-                    submission_time = datetime.now()  # Fallback timestamp
+                    submission_time = now  # Fallback timestamp
                     
                     events.append({
                         'timestamp': submission_time,
@@ -889,8 +930,17 @@ def display_player_history():
                         }
                     })
         
+        # Parse the ISO timestamp strings in one vectorized call; datetimes are used as-is
+        pending = [event for event in events if isinstance(event['timestamp'], str)]
+        if pending:
+            parsed = pd.to_datetime([event['timestamp'] for event in pending], format='ISO8601')
+            for event, timestamp in zip(pending, parsed):
+                event['timestamp'] = timestamp
+                if 'submission_time' in event['details']:
+                    event['details']['submission_time'] = timestamp
+        
         # Sort events chronologically
-        events.sort(key=lambda x: x['timestamp'])
+        events.sort(key=itemgetter('timestamp'))
         
         if not events:
             st.info(f"No history found for {selected_player}. They may not have participated in any rounds yet.")
@@ -899,57 +949,30 @@ def display_player_history():
         # Display events in chronological order
         st.markdown(f"**Total Events:** {len(events)}")
         
-        # Calculate running balance for transactions
-        running_balance = 0
-        for event in events:
-            if event['type'] == 'Transaction':
-                running_balance += event['details']['amount']
-                event['details']['balance_after'] = running_balance
+        # Calculate running balance for transactions in one cumulative sum
+        type_counts = Counter(event['type'] for event in events)
+        transaction_events = [event for event in events if event['type'] == 'Transaction']
+        # np.array keeps integer amounts integral; tolist() hands back Python numbers for formatting
+        balances = np.cumsum(np.array([event['details']['amount'] for event in transaction_events])).tolist()
+        for event, balance in zip(transaction_events, balances):
+            event['details']['balance_after'] = balance
+        running_balance = balances[-1] if balances else 0
         
-        # Display timeline
-        for i, event in enumerate(events):
-            # Create expandable sections for each event
-            with st.expander(
-                f"**{event['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}** - {event['type']}: {event['description']}",
-                expanded=(i < 3)  # Expand first 3 events by default
-            ):
-                col1, col2 = st.columns([1, 3])
-                
-                with col1:
-                    st.markdown(f"**Type:** {event['type']}")
-                    st.markdown(f"**Time:** {event['timestamp'].strftime('%H:%M:%S')}")
-                
-                with col2:
-                    if event['type'] == 'Transaction':
-                        details = event['details']
-                        color = "green" if details['amount'] >= 0 else "red"
-                        st.markdown(f"**Amount:** <span style='color: {color}'>${details['amount']:+}</span>", unsafe_allow_html=True)
-                        st.markdown(f"**Reason:** {details['reason']}")
-                        st.markdown(f"**Balance After:** ${details['balance_after']:,}")
-                    
-                    elif event['type'] == 'Submission':
-                        details = event['details']
-                        st.markdown(f"**Problem:** {details['problem_id']}")
-                        
-                        # Show the full player response
-                        if details['full_response']:
-                            st.markdown("**Player's Complete Response:**")
-                            st.text(details['full_response'])
-                    
-                    elif event['type'] == 'Feedback':
-                        details = event['details']
-                        st.markdown(f"**Problem:** {details['problem_id']}")
-                        
-                        # Show Principle Evaluator's reasoning transcript
-                        reasoning_transcript = details['reasoning_transcript']
-                        if reasoning_transcript and reasoning_transcript != 'No reasoning available':
-                            st.markdown("**🧠 Principle Evaluator's Reasoning:**")
-                            st.markdown(reasoning_transcript)
-                        
-                        # Show final reward
-                        if details['reward'] is not None:
-                            color = "green" if details['reward'] >= 0 else "red"
-                            st.markdown(f"**💰 Final Reward: <span style='color: {color}'>${details['reward']:+}</span>**", unsafe_allow_html=True)
+        # Display the timeline as one block of native <details> elements; long timelines only
+        # build the newest page of events until this player's earlier ones are asked for
+        show_all_key = f"{_SHOW_ALL_EVENTS_PREFIX}{selected_player}_{snapshot['status']['start_time']}"
+        shown = events
+        if len(events) > _PLAYER_EVENTS_PAGE and not st.session_state.get(show_all_key):
+            shown = events[-_PLAYER_EVENTS_PAGE:]
+            st.button(f"Load {len(events) - len(shown)} earlier events", key="load_all_player_events",
+                      on_click=lambda: st.session_state.update({show_all_key: True}))
+        hidden = len(events) - len(shown)
+        timestamps = pd.DatetimeIndex([event['timestamp'] for event in shown])
+        st.markdown("".join(
+            build_player_event_html(event, full_time, short_time, expanded=(hidden + i < 3))  # Expand first 3 events by default
+            for i, (event, full_time, short_time) in enumerate(
+                zip(shown, timestamps.strftime('%Y-%m-%d %H:%M:%S'), timestamps.strftime('%H:%M:%S')))
+        ), unsafe_allow_html=True)
         
         # Summary statistics
         st.markdown("---")
@@ -958,16 +981,13 @@ def display_player_history():
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            transaction_count = len([e for e in events if e['type'] == 'Transaction'])
-            st.metric("Transactions", transaction_count)
+            st.metric("Transactions", type_counts['Transaction'])
         
         with col2:
-            submission_count = len([e for e in events if e['type'] == 'Submission'])
-            st.metric("Submissions", submission_count)
+            st.metric("Submissions", type_counts['Submission'])
         
         with col3:
-            feedback_count = len([e for e in events if e['type'] == 'Feedback'])
-            st.metric("Feedback Received", feedback_count)
+            st.metric("Feedback Received", type_counts['Feedback'])
         
         with col4:
             current_balance = running_balance
@@ -978,40 +998,34 @@ def control_panel():
     """Contest control panel."""
     st.sidebar.header("🎮 Contest Controls")
     
-    # Get contest status to determine button states
-    engine = get_contest_engine()
-    status = engine.get_contest_status()
+    # Get contest status to determine button states; shared with the panels until the engine moves
+    status = get_dashboard_snapshot()['status']
+    
+    # Player selection and (re)start are batched in a form, so only submitting reruns the app
+    with st.sidebar.form("contest_setup"):
+        player_names = st.multiselect("Players", get_available_players(), default=["Alice", "Bob"])
+        if not status['is_active']:
+            setup_clicked = st.form_submit_button("🎭 Initialize Contest", type="primary")
+        else:
+            setup_clicked = st.form_submit_button("🔄 Reset Contest", type="primary")
+    
+    if setup_clicked:
+        action = "Resetting" if status['is_active'] else "Initializing"
+        with st.sidebar:
+            with st.spinner(f"{action} contest..."):
+                success, message = initialize_contest(player_names)
+        
+        if success:
+            st.sidebar.success(f"Contest {'reset' if status['is_active'] else 'initialized'} successfully!")
+        else:
+            st.sidebar.error(message)
     
     # Determine button states based on contest status
     if not status['is_active']:
-        # Not initialized - show initialize button and disabled step button
-        initialize_clicked = st.sidebar.button("🎭 Initialize Contest", type="primary", key="initialize_contest")
+        # Not initialized - show disabled step button
         st.sidebar.button("▶️ Step (Not Ready)", disabled=True, key="step_disabled")
-        
-        if initialize_clicked:
-            with st.sidebar:
-                with st.spinner("Initializing contest..."):
-                    success, message = initialize_contest()
-            
-            if success:
-                st.sidebar.success("Contest initialized successfully!")
-            else:
-                st.sidebar.error(message)
     
     else:
-        # Contest is active - show reset button and step button
-        reset_clicked = st.sidebar.button("🔄 Reset Contest", type="primary", key="reset_contest")
-        
-        if reset_clicked:
-            with st.sidebar:
-                with st.spinner("Resetting contest..."):
-                    success, message = initialize_contest()
-            
-            if success:
-                st.sidebar.success("Contest reset successfully!")
-            else:
-                st.sidebar.error(message)
-        
         # Determine step button text and action
         if status['current_problem_index'] >= status['total_problems']:
             # Contest complete
@@ -1033,196 +1047,106 @@ def control_panel():
                     st.sidebar.success(message)
                 else:
                     st.sidebar.error(message)
+            
+            rounds = st.sidebar.number_input("Rounds to run", min_value=1, value=3, step=1, key="rounds_to_run")
+            run_n_clicked = st.sidebar.button(f"⏭️ Run {rounds} Rounds", key="run_n_rounds")
+            
+            if run_n_clicked:
+                with st.sidebar:
+                    with st.spinner(f"Running {rounds} rounds..."):
+                        success, message = run_contest_rounds(rounds)
+                
+                if success:
+                    st.sidebar.success(message)
+                else:
+                    st.sidebar.error(message)
+            
+            run_all_clicked = st.sidebar.button(f"⏩ Run Remaining ({total_probs - current_prob + 1} problems)", key="run_remaining")
+            
+            if run_all_clicked:
+                with st.sidebar:
+                    with st.spinner("Running remaining problems..."):
+                        success, message = run_remaining_contest()
+                
+                if success:
+                    st.sidebar.success(message)
+                else:
+                    st.sidebar.error(message)
+
+@st.cache_resource
+def prewarm_dashboard():
+    """Import the lazily loaded diff and chart modules on a background thread, once per server process."""
+    def warm():
+        get_sequence_matcher()(a=["warm"], b=["warm"]).get_opcodes()
+        import plotly.graph_objects
+        import plotly.io
+    
+    threading.Thread(target=warm, name="dashboard-prewarm", daemon=True).start()
+
+def watch_contest(run_every):
+    """Contest status, polled every run_every; the whole app reruns only when the engine revision moves."""
+    @st.fragment(run_every=run_every)
+    def contest_watcher():
+        # The tabs were drawn from the snapshot taken at this revision; anything newer needs a full rerun
+        if get_contest_engine().revision != st.session_state.get('_snapshot_revision'):
+            st.rerun()
+        display_contest_status(get_dashboard_snapshot())
+    
+    contest_watcher()
+
+def display_isolated(panel, snapshot):
+    """Render a panel as a fragment, so its own widgets rerun just that panel."""
+    @st.fragment
+    def isolated_panel(snapshot):
+        panel(snapshot)
     
-    # Apply custom styling to all primary buttons
-    st.sidebar.markdown("""
-    <style>
-    /* Style all primary Streamlit buttons - including during global app processing */
-    div[data-testid="stButton"] button[kind="primary"],
-    div[data-testid="stButton"] button[kind="primary"]:enabled,
-    div[data-testid="stButton"] button[kind="primary"]:disabled,
-    div[data-testid="stButton"] button[kind="primary"][data-clicked="true"],
-    div[data-testid="stButton"] button[kind="primary"]:active,
-    div[data-testid="stButton"] button[kind="primary"]:focus,
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"],
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"]:enabled,
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"]:disabled,
-    body[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"],
-    [data-testid="stApp"][data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        border: none !important;
-        border-radius: 12px !important;
-        padding: 12px 24px !important;
-        color: white !important;
-        font-size: 16px !important;
-        font-weight: 600 !important;
-        cursor: pointer !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3) !important;
-        width: 100% !important;
-        margin-bottom: 1rem !important;
-        height: auto !important;
-        min-height: 48px !important;
-        outline: none !important;
-        text-decoration: none !important;
-        user-select: none !important;
-        -webkit-user-select: none !important;
-        -moz-user-select: none !important;
-        -ms-user-select: none !important;
-        -webkit-tap-highlight-color: transparent !important;
-        -webkit-appearance: none !important;
-        -moz-appearance: none !important;
-        appearance: none !important;
-        text-shadow: none !important;
-        box-sizing: border-box !important;
-        font-family: inherit !important;
-    }
-    
-    /* Override any Streamlit processing states */
-    div[data-testid="stButton"] button[kind="primary"].stButton > button,
-    div[data-testid="stButton"] button[kind="primary"] > div,
-    div[data-testid="stButton"] button[kind="primary"] span {
-        background: transparent !important;
-        color: white !important;
-    }
-    
-    /* Force override any green processing states and global app processing */
-    div[data-testid="stButton"] button[kind="primary"][style*="background"],
-    div[data-testid="stButton"] button[kind="primary"][style*="green"],
-    div[data-testid="stButton"] button[kind="primary"].st-emotion-cache-*,
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"][style*="background"],
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"][style*="green"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-    }
-    
-    /* Override global app processing styles */
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"],
-    body[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        opacity: 1 !important;
-    }
-    
-    div[data-testid="stButton"] button[kind="primary"]:hover,
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"]:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4) !important;
-        background: linear-gradient(135deg, #764ba2 0%, #667eea 100%) !important;
-        outline: none !important;
-        user-select: none !important;
-    }
-    
-    div[data-testid="stButton"] button[kind="primary"]:active,
-    div[data-testid="stButton"] button[kind="primary"][data-clicked="true"],
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"]:active {
-        transform: translateY(0) !important;
-        box-shadow: 0 2px 10px rgba(102, 126, 234, 0.3) !important;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        outline: none !important;
-        user-select: none !important;
-    }
-    
-    div[data-testid="stButton"] button[kind="primary"]:focus,
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"]:focus {
-        outline: none !important;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3) !important;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        user-select: none !important;
-    }
-    
-    div[data-testid="stButton"] button[kind="primary"]:focus:not(:focus-visible) {
-        outline: none !important;
-    }
-    
-    div[data-testid="stButton"] button[kind="primary"]:focus-visible,
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"]:focus-visible {
-        outline: none !important;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3) !important;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-    }
-    
-    /* Remove any text selection on button text */
-    div[data-testid="stButton"] button[kind="primary"] *,
-    div[data-testid="stButton"] button[kind="primary"]::selection,
-    div[data-testid="stButton"] button[kind="primary"] *::selection {
-        user-select: none !important;
-        -webkit-user-select: none !important;
-        -moz-user-select: none !important;
-        -ms-user-select: none !important;
-        pointer-events: none !important;
-        background: transparent !important;
-        color: inherit !important;
-        text-shadow: none !important;
-    }
-    
-    /* Completely disable selection */
-    div[data-testid="stButton"] button[kind="primary"]::selection {
-        background: transparent !important;
-    }
-    
-    div[data-testid="stButton"] button[kind="primary"]::-moz-selection {
-        background: transparent !important;
-    }
-    
-    /* Disable any highlighting on the button container */
-    div[data-testid="stButton"] {
-        user-select: none !important;
-        -webkit-user-select: none !important;
-        -moz-user-select: none !important;
-        -ms-user-select: none !important;
-    }
-    
-    /* Override any dynamically generated Streamlit styles */
-    div[data-testid="stButton"] button[kind="primary"][class*="st-"],
-    .stApp[data-test-script-state="running"] div[data-testid="stButton"] button[kind="primary"][class*="st-"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    isolated_panel(snapshot)
 
 def main():
     """Main Streamlit application."""
+    prewarm_dashboard()
+    
     st.title("🎭 A Game of LLMs")
     st.markdown("Real-time monitoring of AI agents competing under evolving constitutional rules")
     
     # Control panel in sidebar
     control_panel()
+    display_debug_info()
     
     # Auto-refresh toggle
-    auto_refresh = st.sidebar.checkbox("🔄 Auto-refresh (5s)", value=True)
+    auto_refresh = st.sidebar.checkbox("🔄 Auto-refresh (2s)", value=True)
+    
+    # Engine state for this run; the status watcher reruns the app when it goes stale
+    snapshot = get_dashboard_snapshot()
     
     # Main dashboard
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Overview", "🤖 Principle Evaluator", "📜 Constitution", "💳 Transactions", "👥 Players"])
     
     with tab1:
         # Contest status
-        display_contest_status()
+        watch_contest("2s" if auto_refresh else None)
         
         st.markdown("---")
         
         # Leaderboard
-        display_leaderboard()
+        display_leaderboard(snapshot)
         
         st.markdown("---")
         
-        # Principle Evaluator Output
-        display_principle_evaluator_output()
+        # Latest Principle Evaluator output; the history lives on its own tab
+        display_principle_evaluator_output(snapshot)
     
     with tab2:
-        display_principle_evaluator_output()
+        display_principle_evaluator_output(snapshot, show_history=True)
     
     with tab3:
-        display_constitution()
+        display_isolated(display_constitution, snapshot)
     
     with tab4:
-        display_bank_transactions()
+        display_bank_transactions(snapshot)
     
     with tab5:
-        display_player_history()
-    
-    # Auto-refresh
-    if auto_refresh:
-        time.sleep(2)  # Faster refresh for better real-time feel
-        st.rerun()
+        display_isolated(display_player_history, snapshot)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,7 +1,11 @@
 import asyncio
+import copy
+import os
+import re
 import time
 import logging
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -10,6 +14,23 @@ from models import (
     ContestState, SubmissionResult
 )
 
+# Function name in a stub, and the first fenced python block in a developer response
+_FUNC_NAME_RE = re.compile(r'def\s+(\w+)\s*\(')
+_CODE_BLOCK_RE = re.compile(r'```python\s*(.*?)\s*```', re.DOTALL)
+
+# Parsed config files keyed by (path, mtime_ns); engines get a deep copy so edits stay their own
+_CONFIG_CACHE = {}
+
+
+def _load_config(config_path):
+    """Parse a YAML config once per (path, mtime), with libyaml's C loader when available."""
+    key = (config_path, os.stat(config_path).st_mtime_ns)
+    config = _CONFIG_CACHE.get(key)
+    if config is None:
+        with open(config_path, 'rb') as f:
+            config = _CONFIG_CACHE[key] = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    return copy.deepcopy(config)
+
 
 class ContestEngine:
     _instance = None
@@ -21,8 +42,7 @@ class ContestEngine:
         ContestEngine._instance = self
         
         # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = _load_config(config_path)
         
         # Logging (initialize first)
         logging.basicConfig(
@@ -75,6 +95,11 @@ class ContestEngine:
         """Add callback for events."""
         self.event_callbacks.append(callback)
     
+    def remove_event_callback(self, callback):
+        """Remove a previously added callback."""
+        if callback in self.event_callbacks:
+            self.event_callbacks.remove(callback)
+    
     def _emit_event(self, event_type, data):
         """Emit event to all callbacks."""
         event = {
@@ -312,27 +337,28 @@ class ContestEngine:
         # STEP 1: Collect all submissions into a big list with names AND developer response times
         all_submissions = []
         
-        # Ask each developer to generate a solution
+        # Ask every developer at once; queries are model-bound, so the round takes as long as the slowest
         self.logger.info(f"Requesting solutions from {len(self.developers)} developers...")
-        for dev_name, developer in self.developers.items():
-            try:
-                self.logger.info(f"Requesting solution from {dev_name}...")
-                
-                # Time just this line
-                start_time = time.time()
-                full_response = developer.query(current_problem)
-                response_time = time.time() - start_time
-                
-                # Add to big list for PE evaluation with response timing
-                all_submissions.append({
-                    'name': dev_name,
-                    'full_response': full_response,
-                    'response_time': response_time
-                })
-                
-                self.logger.info(f"Received solution from {dev_name} (took {response_time:.2f}s to respond)")
-            except Exception as e:
-                self.logger.error(f"Error getting solution from {dev_name}: {e}")
+        max_workers = self.config['contest'].get('max_parallel_queries') or len(self.developers) or 1
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="developer-query") as pool:
+            futures = [(dev_name, pool.submit(self._timed_query, dev_name, developer, current_problem))
+                       for dev_name, developer in self.developers.items()]
+            
+            # Collect in registration order so the PE sees submissions as before
+            for dev_name, future in futures:
+                try:
+                    full_response, response_time = future.result()
+                    
+                    # Add to big list for PE evaluation with response timing
+                    all_submissions.append({
+                        'name': dev_name,
+                        'full_response': full_response,
+                        'response_time': response_time
+                    })
+                    
+                    self.logger.info(f"Received solution from {dev_name} (took {response_time:.2f}s to respond)")
+                except Exception as e:
+                    self.logger.error(f"Error getting solution from {dev_name}: {e}")
         
         # STEP 2-4: PE handles extraction, execution, rewards, and constitution updates
         evaluation_result = self.principle_evaluator.evaluate_submissions_simple(
@@ -378,6 +404,15 @@ class ContestEngine:
         if self.state.current_problem_index >= len(self.problems):
             self._end_contest()
     
+    def _timed_query(self, dev_name, developer, problem):
+        """Query one developer, returning its response and how long it took."""
+        self.logger.info(f"Requesting solution from {dev_name}...")
+        
+        # Time just the query; the clock starts in this worker, so waiting for a free worker doesn't count
+        start_time = time.perf_counter()
+        full_response = developer.query(problem)
+        return full_response, time.perf_counter() - start_time
+    
     def _end_contest(self):
         """End the contest and declare winner."""
         self.state.is_active = False
@@ -404,6 +439,14 @@ class ContestEngine:
                 import time
                 time.sleep(2)
     
+    @property
+    def revision(self):
+        """Cheap fingerprint of everything the dashboard shows; changes whenever any of it does."""
+        evaluations = self.principle_evaluator.evaluation_history
+        return (self.state.is_active, self.state.start_time, self.state.current_problem_index,
+                len(self.state.participants), self.bank.version, self.constitution.version,
+                id(evaluations), len(evaluations))
+    
     def get_contest_status(self):
         """Get current contest status."""
         current_problem = self.get_current_problem()
@@ -429,17 +472,16 @@ class ContestEngine:
 
     def _extract_function_code(self, full_response, stub_code):
         """Extract executable function code from full developer response."""
-        import re
-        
         # Extract function name from stub code
-        function_name_match = re.search(r'def\s+(\w+)\s*\(', stub_code)
+        function_name_match = _FUNC_NAME_RE.search(stub_code)
         function_name = function_name_match.group(1) if function_name_match else 'solve'
+        function_def = f"def {function_name}"
         
         # First, try to find code in markdown blocks
-        code_block_match = re.search(r'```python\s*(.*?)\s*```', full_response, re.DOTALL)
+        code_block_match = _CODE_BLOCK_RE.search(full_response)
         if code_block_match:
             code_content = code_block_match.group(1).strip()
-            if f"def {function_name}" in code_content:
+            if function_def in code_content:
                 return code_content
         
         # Try to find the function definition in the response
@@ -448,7 +490,7 @@ class ContestEngine:
         in_function = False
         
         for line in lines:
-            if f"def {function_name}" in line:
+            if function_def in line:
                 in_function = True
                 function_lines.append(line)
             elif in_function:
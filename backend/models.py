@@ -75,6 +75,7 @@ class Constitution:
         self.config_path = config_path
         self.text = self._load_constitution()
         self.history = []
+        self.version = 0  # Bumped on every update so readers can cheaply detect changes
     
     def _load_constitution(self):
         """Load constitution from YAML file."""
@@ -100,6 +101,7 @@ class Constitution:
             "old_text": old_text,
             "new_text": new_text
         })
+        self.version += 1
 
 
 class BankReader:
@@ -154,6 +156,13 @@ class Bank:
     def __init__(self):
         self._balances = {}
         self._transaction_history = []
+        self.version = 0  # Bumped on every change so readers can cache snapshots
+    
+    def reset(self):
+        """Clear all balances and transactions."""
+        self._balances = {}
+        self._transaction_history = []
+        self.version += 1
     
     def get_balance(self, actor):
         """Get current balance for an actor."""
@@ -225,6 +234,7 @@ class Bank:
         
         transaction = {
             "timestamp": datetime.now().isoformat(),
+            "timestamp_epoch": time.time_ns(),
             "actor": actor,
             "delta": delta,
             "old_balance": old_balance,
@@ -233,6 +243,7 @@ class Bank:
         }
         
         self._transaction_history.append(transaction)
+        self.version += 1
     
     # Legacy methods for backward compatibility
     def query_balance(self, actor):
@@ -389,7 +400,7 @@ class PrincipleEvaluator(Developer):
                 }
             ]
             
-            generated_text = self.phi4_model.generate(messages, max_new_tokens=500, temperature=0.1, do_sample=True)
+            generated_text = self.phi4_model.generate(messages, max_new_tokens=500, do_sample=False)
             
             if generated_text is None:
                 result = execution_results[target_dev_name]['result']
@@ -699,7 +710,7 @@ Where [amount] is {target_dev_name}'s final integer reward (positive or negative
                 }
             ]
             
-            generated_text = self.phi4_model.generate(messages, max_new_tokens=500, temperature=0.1, do_sample=True)
+            generated_text = self.phi4_model.generate(messages, max_new_tokens=500, do_sample=False)
             
             if generated_text is None:
                 result = execution_results[target_dev_name]['result']
@@ -1,10 +1,29 @@
 #!/usr/bin/env python3
 
+import copy
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
 import torch
 import transformers
 from typing import Optional, List, Dict, Any
 
 
+MODEL_NAME = "microsoft/Phi-4-mini-instruct"
+
+# Weight quantization on GPU: "4bit" (NF4), "8bit" or "none"
+QUANTIZATION = os.environ.get("PHI4_QUANTIZATION", "4bit").lower()
+
+# torch.compile the transformers forward on GPU; set PHI4_COMPILE=0 to run eagerly
+COMPILE = os.environ.get("PHI4_COMPILE", "1") != "0"
+
+# Draft tokens proposed per step by n-gram prompt-lookup speculative decoding; 0 disables it
+SPECULATIVE_TOKENS = int(os.environ.get("PHI4_SPECULATIVE_TOKENS", "8"))
+
+
 class Phi4ModelManager:
     """Singleton manager for the Phi-4 model that can be shared across all components."""
     
@@ -24,23 +43,43 @@ class Phi4ModelManager:
                 print(f"🤖 Initializing shared Phi-4 model...")
                 
                 self.device = "cuda:0" if torch.cuda.is_available() else "cpu"
-                self.pipeline = transformers.pipeline(
-                    "text-generation",
-                    model="microsoft/Phi-4-mini-instruct",
-                    model_kwargs={"torch_dtype": "auto"},
-                    device_map="cuda:0" if torch.cuda.is_available() else "auto",
-                    trust_remote_code=True
-                )
+                self.pipeline = None
+                self.llm = None
+                self._prefix_ids = {}
+                self._prefix_kv = {}
+                self._eager_forward = None
+                
+                # Prefer vLLM on GPU (paged KV cache + continuous batching), else the HF pipeline
+                if torch.cuda.is_available() and self._load_vllm():
+                    self.backend = "vllm"
+                    self.tokenizer = self.llm.get_tokenizer()
+                else:
+                    model_kwargs = {"torch_dtype": self._compute_dtype()}
+                    quantization_config = self._quantization_config()
+                    if quantization_config is not None:
+                        model_kwargs["quantization_config"] = quantization_config
+                    
+                    self.pipeline = transformers.pipeline(
+                        "text-generation",
+                        model=MODEL_NAME,
+                        model_kwargs=model_kwargs,
+                        device_map="cuda:0" if torch.cuda.is_available() else "auto",
+                        trust_remote_code=True
+                    )
+                    self.backend = "transformers"
+                    self.tokenizer = self.pipeline.tokenizer
+                    self._compile_model()
                 
                 self.model_loaded = True
                 self.initialized = True
-                print(f"✅ Shared Phi-4 model initialized successfully on {self.device}")
+                print(f"✅ Shared Phi-4 model initialized successfully on {self.device} ({self.backend})")
                 return True
                 
             except Exception as e:
                 print(f"❌ Failed to initialize Phi-4 model: {e}")
                 print(f"🚫 Will not attempt to load model again in this session")
                 self.pipeline = None
+                self.llm = None
                 self.model_loaded = False
                 self.initialized = True  # Mark as initialized even if failed
                 return False
@@ -51,55 +90,355 @@ class Phi4ModelManager:
                 print(f"⚠️ Phi-4 model initialization was previously attempted and failed")
             return self.model_loaded
     
+    def _compute_dtype(self):
+        """bf16 on GPUs that support it (fp32 range at half the bandwidth), else the checkpoint dtype."""
+        if torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        return "auto"
+    
+    def _compile_model(self):
+        """torch.compile the model forward and warm it up so queries don't pay the compile cost."""
+        if not COMPILE or not torch.cuda.is_available():
+            return
+        
+        model = self.pipeline.model
+        eager_forward = self._eager_forward = model.forward
+        try:
+            # "default" mode: no CUDA graphs, which a growing DynamicCache would keep re-capturing
+            model.forward = torch.compile(eager_forward, mode="default", fullgraph=False, dynamic=True)
+            warmup_ids = self.tokenizer("def warmup():", return_tensors="pt").input_ids.to(model.device)
+            with torch.no_grad():
+                model.generate(warmup_ids, max_new_tokens=4, do_sample=False,
+                               pad_token_id=self.tokenizer.eos_token_id)
+            print("⚡ Phi-4 forward compiled with torch.compile")
+        except Exception as e:
+            print(f"⚠️ torch.compile failed, running Phi-4 eagerly: {e}")
+            model.forward = eager_forward
+            self._eager_forward = None
+    
+    def _quantization_config(self):
+        """BitsAndBytes config for the transformers backend, or None to load full-precision weights."""
+        if QUANTIZATION not in ("4bit", "8bit") or not torch.cuda.is_available():
+            return None
+        
+        try:
+            import bitsandbytes  # noqa: F401 - only needed to confirm the kernels are installed
+        except ImportError:
+            print("⚠️ bitsandbytes not installed, loading Phi-4 without quantization")
+            return None
+        
+        if QUANTIZATION == "8bit":
+            return transformers.BitsAndBytesConfig(load_in_8bit=True)
+        # NF4 matmuls run in the compute dtype; GPUs without bf16 (T4, V100) need fp16
+        compute_dtype = self._compute_dtype()
+        return transformers.BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=compute_dtype if compute_dtype != "auto" else torch.float16,
+            bnb_4bit_quant_type="nf4"
+        )
+    
+    def _load_vllm(self) -> bool:
+        """Load the model into a vLLM engine; returns False if vLLM is unavailable."""
+        try:
+            from vllm import LLM
+        except ImportError:
+            return False
+        
+        quantization_kwargs = {}
+        if QUANTIZATION == "4bit":
+            quantization_kwargs = {"quantization": "bitsandbytes", "load_format": "bitsandbytes"}
+        elif QUANTIZATION == "8bit":
+            quantization_kwargs = {"quantization": "fp8"}
+        
+        # Drafts come from n-grams already in the prompt; code answers repeat the stub a lot
+        speculative_kwargs = {}
+        if SPECULATIVE_TOKENS > 0:
+            speculative_kwargs = {"speculative_config": {
+                "method": "ngram",
+                "num_speculative_tokens": SPECULATIVE_TOKENS,
+                "prompt_lookup_max": 4
+            }}
+        
+        try:
+            self.llm = LLM(
+                model=MODEL_NAME,
+                dtype="bfloat16" if torch.cuda.is_bf16_supported() else "auto",
+                block_size=16,
+                max_num_seqs=48,
+                enable_prefix_caching=True,
+                trust_remote_code=True,
+                **quantization_kwargs,
+                **speculative_kwargs
+            )
+            return True
+        except Exception as e:
+            print(f"⚠️ vLLM engine failed to start, falling back to transformers: {e}")
+            self.llm = None
+            return False
+    
     def generate(self, messages: List[Dict[str, str]], max_new_tokens: int = 100, 
-                temperature: float = 0.1, do_sample: bool = True) -> Optional[str]:
+                temperature: float = 0.1, do_sample: bool = True, prefix: Optional[str] = None,
+                stop: Optional[List[str]] = None) -> Optional[str]:
         """Generate text using the Phi-4 model."""
+        return self.generate_batch([messages], max_new_tokens, temperature, do_sample, [prefix], stop)[0]
+    
+    def generate_batch(self, conversations: List[List[Dict[str, str]]], max_new_tokens: int = 100,
+                       temperature: float = 0.1, do_sample: bool = True,
+                       prefixes: Optional[List[Optional[str]]] = None,
+                       stop: Optional[List[str]] = None) -> List[Optional[str]]:
+        """Generate one reply per conversation in a single padded model.generate pass.
+        
+        prefixes optionally names, per conversation, a stable leading piece of prompt text
+        (e.g. a player's personality) whose KV cache can be reused across calls.
+        stop lists strings that end a reply early instead of running to max_new_tokens.
+        """
         # Don't even try if we know it failed
         if self.initialized and not self.model_loaded:
-            return None
+            return [None] * len(conversations)
             
-        if not self.initialized or not hasattr(self, 'pipeline') or self.pipeline is None:
+        if not self.is_available():
             if not self.initialize_model():
-                return None
+                return [None] * len(conversations)
         
         try:
-            outputs = self.pipeline(
-                messages, 
-                max_new_tokens=max_new_tokens, 
-                temperature=temperature, 
-                do_sample=do_sample
-            )
+            if self.backend == "vllm":
+                # vLLM's automatic prefix caching finds shared prefixes on its own
+                return self._generate_batch_vllm(conversations, max_new_tokens, temperature, do_sample, stop)
             
-            if outputs and len(outputs) > 0:
-                return outputs[0]["generated_text"][-1]["content"]
-            return None
+            tokenizer = self.pipeline.tokenizer
+            model = self.pipeline.model
+            
+            # Left padding keeps every prompt flush against its generated tokens
+            tokenizer.padding_side = "left"
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            
+            prompts = [
+                tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+                for messages in conversations
+            ]
+            
+            generation_kwargs = {
+                "max_new_tokens": max_new_tokens,
+                "do_sample": do_sample,
+                "pad_token_id": tokenizer.pad_token_id
+            }
+            if do_sample:
+                generation_kwargs["temperature"] = temperature
+            if stop:
+                generation_kwargs["stop_strings"] = list(stop)
+                generation_kwargs["tokenizer"] = tokenizer
+            # Assisted generation only supports a batch of one
+            if SPECULATIVE_TOKENS > 0 and len(prompts) == 1:
+                generation_kwargs["prompt_lookup_num_tokens"] = SPECULATIVE_TOKENS
+            
+            prefixes = prefixes or [None] * len(prompts)
+            inputs = self._encode_batch(prompts, prefixes)
+            
+            with torch.no_grad():
+                try:
+                    outputs = model.generate(**inputs, **generation_kwargs)
+                except Exception as e:
+                    if self._eager_forward is None:
+                        raise
+                    # The compiled forward can still fail on shapes warmup never saw; run eagerly from now on
+                    print(f"⚠️ Compiled Phi-4 forward failed, falling back to eager: {e}")
+                    model.forward = self._eager_forward
+                    self._eager_forward = None
+                    # generate() may have extended the cache copy it was given, so encode afresh
+                    inputs = self._encode_batch(prompts, prefixes)
+                    outputs = model.generate(**inputs, **generation_kwargs)
+            
+            # Strip the (padded) prompt from every row before decoding
+            new_tokens = outputs[:, inputs["input_ids"].shape[1]:]
+            return tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
             
         except Exception as e:
             print(f"❌ Error generating text with Phi-4: {e}")
+            return [None] * len(conversations)
+    
+    def _encode_batch(self, prompts: List[str], prefixes: List[Optional[str]]) -> Dict[str, Any]:
+        """generate() inputs for rendered prompts."""
+        # A lone request can resume from its cached prefix; padded batches shift positions,
+        # so they only reuse the prefix token ids
+        if len(prompts) == 1 and self._split_prefix(prompts[0], prefixes[0]):
+            return self._encode_with_prefix_cache(prompts[0], prefixes[0])
+        input_ids = [self._prompt_ids(prompt, prefix) for prompt, prefix in zip(prompts, prefixes)]
+        return self.tokenizer.pad({"input_ids": input_ids}, padding=True,
+                                  return_tensors="pt").to(self.pipeline.model.device)
+    
+    def register_prefix(self, prefix: str):
+        """Tokenize a prompt prefix ahead of time so later requests only tokenize their suffix."""
+        if not self.is_available() or self.backend != "transformers" or not prefix:
+            return
+        prompt = self.tokenizer.apply_chat_template([{"role": "user", "content": prefix}],
+                                                    tokenize=False, add_generation_prompt=False)
+        split = self._split_prefix(prompt, prefix)
+        if split:
+            self._head_ids(split[0])
+    
+    def _split_prefix(self, prompt: str, prefix: Optional[str]) -> Optional[tuple]:
+        """Split a rendered prompt into (head, tail) right after prefix, or None if it isn't there."""
+        if not prefix or prefix not in prompt:
             return None
+        split = prompt.index(prefix) + len(prefix)
+        return prompt[:split], prompt[split:]
+    
+    def _head_ids(self, head: str) -> List[int]:
+        """Token ids for a rendered prompt head, tokenized once per distinct head."""
+        if head not in self._prefix_ids:
+            self._prefix_ids[head] = self.tokenizer(head, add_special_tokens=False).input_ids
+        return self._prefix_ids[head]
+    
+    def _prompt_ids(self, prompt: str, prefix: Optional[str]) -> List[int]:
+        """Token ids for a rendered prompt, reusing the cached ids of its prefix when present."""
+        split = self._split_prefix(prompt, prefix)
+        if split is None:
+            return self.tokenizer(prompt, add_special_tokens=False).input_ids
+        head, tail = split
+        return self._head_ids(head) + self.tokenizer(tail, add_special_tokens=False).input_ids
+    
+    def _encode_with_prefix_cache(self, prompt: str, prefix: str) -> Dict[str, Any]:
+        """Build generate() inputs for prompt, seeding past_key_values from the cached prefix KV."""
+        model = self.pipeline.model
+        
+        head, tail = self._split_prefix(prompt, prefix)
+        head_ids = torch.tensor([self._head_ids(head)], device=model.device)
+        
+        if head not in self._prefix_kv:
+            # Compiled forwards may hand back buffers they reuse, so the stored prefix is
+            # computed eagerly and cloned out of whatever buffers produced it
+            forward = self._eager_forward or model
+            with torch.no_grad():
+                self._prefix_kv[head] = copy.deepcopy(forward(input_ids=head_ids, use_cache=True).past_key_values)
+        past_key_values = self._prefix_kv[head]
+        
+        tail_ids = self.tokenizer(tail, return_tensors="pt", add_special_tokens=False).input_ids.to(model.device)
+        input_ids = torch.cat([head_ids, tail_ids], dim=1)
+        
+        return {
+            "input_ids": input_ids,
+            "attention_mask": torch.ones_like(input_ids),
+            # generate() extends the cache in place, so every call gets its own copy
+            "past_key_values": copy.deepcopy(past_key_values)
+        }
+    
+    def _generate_batch_vllm(self, conversations: List[List[Dict[str, str]]], max_new_tokens: int,
+                             temperature: float, do_sample: bool,
+                             stop: Optional[List[str]] = None) -> List[Optional[str]]:
+        """Hand the whole batch to vLLM, which schedules it with continuous batching."""
+        from vllm import SamplingParams
+        
+        sampling_params = SamplingParams(
+            temperature=temperature if do_sample else 0.0,
+            max_tokens=max_new_tokens,
+            stop=list(stop) if stop else None
+        )
+        outputs = self.llm.chat(conversations, sampling_params, use_tqdm=False)
+        return [output.outputs[0].text if output.outputs else None for output in outputs]
     
     def is_available(self) -> bool:
         """Check if the model is available and loaded."""
         return (self.initialized and 
-                hasattr(self, 'model_loaded') and 
-                self.model_loaded and 
-                hasattr(self, 'pipeline') and 
-                self.pipeline is not None)
+                getattr(self, 'model_loaded', False) and 
+                (getattr(self, 'pipeline', None) is not None or 
+                 getattr(self, 'llm', None) is not None))
     
     def get_device_info(self) -> str:
         """Get information about the device the model is running on."""
-        if hasattr(self, 'pipeline') and self.pipeline is not None:
+        if getattr(self, 'pipeline', None) is not None or getattr(self, 'llm', None) is not None:
             device = getattr(self, 'device', 'unknown')
-            return f"Device: {device}, Available: {self.is_available()}"
+            return f"Device: {device}, Backend: {self.backend}, Available: {self.is_available()}"
         return "Model not loaded"
 
 
+class BatchingPhi4Model:
+    """Dynamic batcher that coalesces concurrent generate requests into shared model passes."""
+    
+    def __init__(self, model: Phi4ModelManager, max_batch_size: int = 8, batch_timeout: float = 0.01):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="phi4-batcher", daemon=True)
+        self._worker.start()
+    
+    def __getattr__(self, name):
+        # Everything except submit() is served by the wrapped model manager
+        return getattr(self.model, name)
+    
+    def submit(self, messages: List[Dict[str, str]], max_new_tokens: int = 100,
+               temperature: float = 0.1, do_sample: bool = True, prefix: Optional[str] = None,
+               stop: Optional[List[str]] = None) -> Future:
+        """Queue a generate request; the returned future resolves to the generated text."""
+        future = Future()
+        # Temperature is irrelevant to greedy requests, so they all share one batch group
+        params = (max_new_tokens, temperature if do_sample else 0.0, do_sample, tuple(stop) if stop else None)
+        self._requests.put((messages, params, prefix, future))
+        return future
+    
+    def _run(self):
+        """Drain the queue forever, collecting up to max_batch_size requests per batch_timeout window."""
+        while True:
+            batch = [self._requests.get()]
+            deadline = time.monotonic() + self.batch_timeout
+            
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            self._process_batch(batch)
+    
+    def _process_batch(self, batch):
+        """Run one generate_batch call per distinct set of generation parameters."""
+        groups = {}
+        for messages, params, prefix, future in batch:
+            if future.set_running_or_notify_cancel():
+                groups.setdefault(params, []).append((messages, prefix, future))
+        
+        for (max_new_tokens, temperature, do_sample, stop), requests in groups.items():
+            try:
+                texts = self.model.generate_batch(
+                    [messages for messages, _, _ in requests],
+                    max_new_tokens=max_new_tokens,
+                    temperature=temperature,
+                    do_sample=do_sample,
+                    prefixes=[prefix for _, prefix, _ in requests],
+                    stop=list(stop) if stop else None
+                )
+            except Exception as e:
+                for _, _, future in requests:
+                    future.set_exception(e)
+                continue
+            
+            for (_, _, future), text in zip(requests, texts):
+                future.set_result(text)
+
+
+_batching_model = None
+_batching_lock = threading.Lock()
+
+
 # Global function for easy access
 def get_phi4_model() -> Phi4ModelManager:
     """Get the global Phi-4 model manager instance."""
     return Phi4ModelManager()
 
 
+def get_batching_phi4_model() -> BatchingPhi4Model:
+    """Get the global batching front-end for the shared Phi-4 model."""
+    global _batching_model
+    with _batching_lock:
+        if _batching_model is None:
+            _batching_model = BatchingPhi4Model(get_phi4_model())
+    return _batching_model
+
+
 # Verification that singleton works correctly
 if __name__ == "__main__":
     print("Testing Phi4ModelManager singleton behavior...")
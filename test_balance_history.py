@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+from app import build_balance_history
+
+def test_round_zero_transactions_count_towards_balance():
+    """Deltas recorded before round 1 must carry into every plotted balance."""
+    
+    print("🧪 Testing leaderboard balance history...")
+    
+    players = ("alice", "bob")
+    transactions = [
+        {"actor": "alice", "delta": 100, "reason": "Submission 0 starting grant", "timestamp": "2025-01-01T00:00:01", "timestamp_epoch": 1},
+        {"actor": "alice", "delta": 10, "reason": "Problem 1 reward", "timestamp": "2025-01-01T00:00:02", "timestamp_epoch": 2},
+        {"actor": "bob", "delta": -5, "reason": "Problem 1 penalty", "timestamp": "2025-01-01T00:00:03", "timestamp_epoch": 3},
+        {"actor": "alice", "delta": 20, "reason": "Problem 2 reward", "timestamp": "2025-01-01T00:00:04", "timestamp_epoch": 4},
+    ]
+    
+    history = build_balance_history(transactions, players)
+    balances = {(row["round"], row["player"]): row["balance"] for _, row in history.iterrows()}
+    print(history.to_string(index=False))
+    
+    # Round 0 stays the $0 starting point and is the only round-0 point
+    assert sorted(history["round"].unique()) == [0, 1, 2], f"Unexpected rounds: {sorted(history['round'].unique())}"
+    assert balances[(0, "alice")] == 0 and balances[(0, "bob")] == 0, "Round 0 should start everyone at $0"
+    
+    # The round-0 grant is included in every later running balance
+    assert balances[(1, "alice")] == 110, f"Round 1 alice: {balances[(1, 'alice')]}"
+    assert balances[(2, "alice")] == 130, f"Round 2 alice: {balances[(2, 'alice')]}"
+    assert balances[(1, "bob")] == -5 and balances[(2, "bob")] == -5, "Bob's balance should stay flat after round 1"
+    
+    print("\n✅ Round-0 transactions carry into the running balance")
+
+if __name__ == "__main__":
+    test_round_zero_transactions_count_towards_balance()
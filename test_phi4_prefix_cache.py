@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+from backend.phi4_model import get_phi4_model
+
+def test_prefix_cache_matches_unprefixed_generate():
+    """Greedy replies must not change when the prompt prefix is served from the cached KV."""
+    
+    print("🧪 Testing Phi-4 prefix KV cache...")
+    
+    model = get_phi4_model()
+    if not model.initialize_model():
+        print("⚠️ Phi-4 model unavailable, skipping prefix cache test")
+        return
+    
+    prefix = "You are a careful Python developer who writes short, correct solutions."
+    messages = [{"role": "user", "content": f"{prefix}\n\nImplement def add(a, b) that returns a + b."}]
+    
+    # Reference reply without any prefix cache
+    expected = model.generate(messages, max_new_tokens=48, do_sample=False)
+    
+    # The first prefixed call fills the cache, the second starts from it
+    first = model.generate(messages, max_new_tokens=48, do_sample=False, prefix=prefix)
+    second = model.generate(messages, max_new_tokens=48, do_sample=False, prefix=prefix)
+    
+    assert expected is not None, "Unprefixed generate failed"
+    assert first == expected, f"First prefixed reply differs:\n{first!r}\nvs\n{expected!r}"
+    assert second == expected, f"Cached prefix reply differs:\n{second!r}\nvs\n{expected!r}"
+    
+    print("\n✅ Prefixed replies match the unprefixed reply")
+
+if __name__ == "__main__":
+    test_prefix_cache_matches_unprefixed_generate()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Minify assets/theme.src.css into assets/theme.min.css for the Streamlit app.
+
+Uses csscompressor when it is installed (pip install csscompressor), otherwise
+a small built-in minifier that strips comments and redundant whitespace.
+
+Run with --report-unused to list selectors whose classes are never emitted by
+the app's HTML, so dead rules can be deleted from the source stylesheet.
+"""
+
+import glob
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "assets", "theme.src.css")
+TARGET = os.path.join(ROOT, "assets", "theme.min.css")
+
+
+def minify(css: str) -> str:
+    """Minify a stylesheet, preferring csscompressor when available."""
+    try:
+        from csscompressor import compress
+        return compress(css)
+    except ImportError:
+        pass
+    
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)  # Comments
+    css = re.sub(r'\s+', ' ', css)                         # Collapse whitespace
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)           # Space around punctuation
+    css = re.sub(r':\s+', ':', css)                        # Space after property colons
+    css = css.replace(';}', '}')                           # Final semicolon in a block
+    return css.strip()
+
+
+def unused_selectors(css: str, html_sources) -> list:
+    """Selectors naming a custom class that no class="..." attribute in html_sources uses."""
+    used = set()
+    for text in html_sources:
+        for attr in re.findall(r'class="([^"{}]*)"', text):
+            used.update(attr.split())
+    
+    unused = []
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    for selectors in re.findall(r'([^{}]+)\{', css):
+        for selector in selectors.split(','):
+            selector = selector.strip()
+            # Streamlit's own .st* classes are rendered by the frontend, not by our HTML
+            classes = [c for c in re.findall(r'\.([\w-]+)', selector) if not c.startswith('st')]
+            if any(c not in used for c in classes):
+                unused.append(selector)
+    return unused
+
+
+def report_unused():
+    """Print the selectors in the source stylesheet that the app never matches."""
+    with open(SOURCE, 'r') as f:
+        source = f.read()
+    
+    html_sources = []
+    for path in glob.glob(os.path.join(ROOT, "**", "*.py"), recursive=True):
+        with open(path, 'r') as f:
+            html_sources.append(f.read())
+    
+    unused = unused_selectors(source, html_sources)
+    for selector in unused:
+        print(f"🗑️ {selector}")
+    print(f"🎨 {len(unused)} unused selector(s) in {os.path.relpath(SOURCE, ROOT)}")
+
+
+def build_css():
+    """Write the minified stylesheet and report the size reduction."""
+    with open(SOURCE, 'r') as f:
+        source = f.read()
+    
+    minified = minify(source)
+    with open(TARGET, 'w') as f:
+        f.write(minified + "\n")
+    
+    print(f"🎨 {os.path.relpath(TARGET, ROOT)}: {len(source):,} -> {len(minified):,} bytes")
+
+
+if __name__ == "__main__":
+    if "--report-unused" in sys.argv[1:]:
+        report_unused()
+    else:
+        build_css()